@@ -0,0 +1,135 @@
+import numpy as np
+from envelope import IN_M, IN_H, OUT_M, OUT_H, IN_SERVICE_PRESSURE, OUT_OF_SERVICE_PRESSURE
+
+class StrutLayout:
+    # Plan geometry of one tie frame, mast centre at the origin and metres throughout.
+    # Strut k runs from mast_points[k] to wall_points[k]; a positive force is tension.
+    def __init__(self, mast_points, wall_points):
+        mast_points = np.asarray(mast_points, dtype=float)
+        wall_points = np.asarray(wall_points, dtype=float)
+        if mast_points.shape != (3, 2) or wall_points.shape != (3, 2):
+            raise ValueError("A tie frame needs exactly three struts")
+        directions = wall_points - mast_points
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        # Rows: force x, force y, torque about the mast axis, for a unit force in each strut
+        torque = mast_points[:, 0] * directions[:, 1] - mast_points[:, 1] * directions[:, 0]
+        matrix = np.vstack([directions[:, 0], directions[:, 1], torque])
+        if abs(np.linalg.det(matrix)) < 1e-9:
+            raise ValueError("Strut layout is unstable (struts are parallel or meet at one point)")
+        self.inverse = np.linalg.inv(matrix)
+
+# Two struts to the left corner and one to the right, wall 4 m from a 2 m mast
+DEFAULT_LAYOUT = StrutLayout([(-1.0, 1.0), (1.0, 1.0), (1.0, 1.0)], [(-2.0, 5.0), (-1.0, 5.0), (3.0, 5.0)])
+
+class LoadCase:
+    # Crane moment and horizontal force at the mast top, distributed mast wind
+    # load (force per metre of height) and slewing torque
+    def __init__(self, name, moment, horizontal, wind_per_metre, torque=0.0):
+        self.name = name
+        self.moment = moment
+        self.horizontal = horizontal
+        self.wind_per_metre = wind_per_metre
+        self.torque = torque
+
+def tie_loads(tie_heights, tower_height, cases):
+    # Force each tie takes, per case: (moment part, horizontal part), each (cases, ties).
+    # The mast above the top tie is a cantilever; each span below is treated as
+    # simply supported, so the top two ties share the cantilever moment.
+    z = np.sort(np.asarray(tie_heights, dtype=float))
+    if not len(z) or z[-1] >= tower_height:
+        raise ValueError("Tie heights must be below the tower height")
+    moment = np.array([case.moment for case in cases], dtype=float)[:, None]
+    horizontal = np.array([case.horizontal for case in cases], dtype=float)[:, None]
+    wind = np.array([case.wind_per_metre for case in cases], dtype=float)[:, None]
+
+    overhang = tower_height - z[-1]
+    spans = np.diff(np.concatenate([[0.0], z]))
+    # Wind on each tie: half of every span it supports (the bottom span also loads the base)
+    below = spans
+    above = np.concatenate([spans[1:], [0.0]])
+    wind_share = wind * (below + above)[None, :] / 2
+    wind_share[:, -1] += (wind * overhang)[:, 0]
+
+    cantilever_moment = moment + horizontal * overhang + wind * overhang ** 2 / 2
+    from_moment = np.zeros((len(cases), len(z)))
+    from_horizontal = wind_share.copy()
+    from_horizontal[:, -1] += horizontal[:, 0]
+    if len(z) > 1:
+        # Cantilever moment resolved as a couple over the top span
+        lever = spans[-1]
+        from_moment[:, -1] = cantilever_moment[:, 0] / lever
+        from_moment[:, -2] = -cantilever_moment[:, 0] / lever
+    else:
+        # Single tie: the base takes the couple, the tie takes it over the full height
+        from_moment[:, -1] = cantilever_moment[:, 0] / z[-1]
+    return from_moment, from_horizontal
+
+def strut_forces(tie_heights, tower_height, cases, slew_angles, wind_angles, layout=DEFAULT_LAYOUT):
+    # Axial strut forces with shape (cases, ties, slew angles, wind angles, 3).
+    # The crane moment acts in the slew direction, horizontal force and mast wind
+    # in the wind direction. Angles in degrees.
+    from_moment, from_horizontal = tie_loads(tie_heights, tower_height, cases)
+    slew = np.radians(np.asarray(slew_angles, dtype=float))
+    wind = np.radians(np.asarray(wind_angles, dtype=float))
+    slew_unit = np.stack([np.cos(slew), np.sin(slew)], axis=-1)
+    wind_unit = np.stack([np.cos(wind), np.sin(wind)], axis=-1)
+
+    # Load on each tie (cases, ties, slew, wind, 2)
+    load = (from_moment[:, :, None, None, None] * slew_unit[None, None, :, None, :]
+            + from_horizontal[:, :, None, None, None] * wind_unit[None, None, None, :, :])
+    torque = np.array([case.torque for case in cases], dtype=float)
+    # Only the top tie resists the slewing torque
+    torques = np.zeros(load.shape[:-1])
+    torques[:, -1] = torque[:, None, None]
+    # Struts must balance the load: inverse @ -(Fx, Fy, T)
+    rhs = -np.concatenate([load, torques[..., None]], axis=-1)
+    return np.einsum("kj,ctswj->ctswk", layout.inverse, rhs)
+
+def anchorage_envelope(tie_heights, tower_height, cases, slew_step=1.0, wind_step=10.0, layout=DEFAULT_LAYOUT):
+    # Per tie (sorted by height) and strut: max tension and compression with the
+    # case, slew angle and wind angle that produce them
+    slew_angles = np.arange(0.0, 360.0, slew_step)
+    wind_angles = np.arange(0.0, 360.0, wind_step)
+    forces = strut_forces(tie_heights, tower_height, cases, slew_angles, wind_angles, layout)
+    heights = np.sort(np.asarray(tie_heights, dtype=float))
+    # (ties, struts, cases * slew * wind)
+    flat = np.moveaxis(forces, (1, 4), (0, 1)).reshape(len(heights), 3, -1)
+    shape = (len(cases), len(slew_angles), len(wind_angles))
+    results = []
+    for t, height in enumerate(heights):
+        for k in range(3):
+            values = flat[t, k]
+            entry = {"tie_height": float(height), "strut": k + 1}
+            for label, position in (("tension", np.argmax(values)), ("compression", np.argmin(values))):
+                c, s, w = np.unravel_index(position, shape)
+                entry[label] = float(values[position])
+                entry[f"{label}_case"] = (cases[c].name, float(slew_angles[s]), float(wind_angles[w]))
+            results.append(entry)
+    return results
+
+def crane_cases(crane_row, mast_row, in_service_pressure=IN_SERVICE_PRESSURE,
+                out_of_service_pressure=OUT_OF_SERVICE_PRESSURE, slewing_torque=0.0):
+    # In-service and out-of-service load cases from a crane_data row and mast_data row
+    _, _, mast_height, mast_wind_area = mast_row
+    area_per_metre = mast_wind_area / mast_height
+    return [
+        LoadCase("in service", crane_row[IN_M], crane_row[IN_H], in_service_pressure * area_per_metre, slewing_torque),
+        LoadCase("out of service", crane_row[OUT_M], crane_row[OUT_H], out_of_service_pressure * area_per_metre),
+    ]
+
+def crane_anchorage(crane_model, jib_length, mast_model, sections, tie_heights, **kwargs):
+    from jib_index import crane_jib_index
+    from main import cached_mast_data
+    index = crane_jib_index(crane_model)
+    row = index.get(jib_length) or index.interpolate(jib_length)
+    if row is None:
+        raise ValueError(f"No data for {crane_model} at jib length {jib_length}")
+    mast = cached_mast_data(mast_model)
+    if mast is None:
+        raise ValueError(f"No data for mast model {mast_model}")
+    tower_height = mast[2] * sections
+    layout = kwargs.pop("layout", DEFAULT_LAYOUT)
+    slew_step = kwargs.pop("slew_step", 1.0)
+    wind_step = kwargs.pop("wind_step", 10.0)
+    return anchorage_envelope(tie_heights, tower_height, crane_cases(row, mast, **kwargs),
+                              slew_step, wind_step, layout)
@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PACKAGE_DIR)
+
+import main
+from main import CraneDatabase, MastDatabase
+
+# A benchmark counts as regressed when it is this much slower than the baseline
+TOLERANCE = 0.25
+
+def synthetic_row(jib_length):
+    return [jib_length, 1000 + jib_length * 20, 300 + jib_length, 20 + jib_length / 10,
+            800 + jib_length * 15, 280 + jib_length, 40 + jib_length / 5, 2, 10 - jib_length / 20,
+            jib_length, 30, 1.5]
+
+def timed(fn, repeat=1):
+    # Median seconds per call
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def bench_catalog(models, jib_lengths, results):
+    names = [f"bench{i:05d}" for i in range(models)]
+    jibs = [20.0 + 0.5 * i for i in range(jib_lengths)]
+    prefix = f"{models}x{jib_lengths}"
+
+    start = time.perf_counter()
+    for name in names:
+        CraneDatabase(name).close()
+    results[f"{prefix}/create_model"] = (time.perf_counter() - start) / models
+
+    # add_data commits per row, so only time it on a sample of models
+    sample = names[:min(models, 10)]
+    start = time.perf_counter()
+    for name in sample:
+        db = CraneDatabase(name)
+        for jib in jibs:
+            db.add_data(*synthetic_row(jib))
+        db.close()
+    results[f"{prefix}/add_data_row"] = (time.perf_counter() - start) / (len(sample) * len(jibs))
+
+    start = time.perf_counter()
+    for name in names:
+        db = CraneDatabase(name)
+        db.add_many(synthetic_row(jib) for jib in jibs)
+        db.close()
+    results[f"{prefix}/add_many_row"] = (time.perf_counter() - start) / (models * len(jibs))
+
+    lookups = [(random.choice(names), random.choice(jibs)) for _ in range(1000)]
+
+    def get_uncached():
+        for name, jib in lookups:
+            db = CraneDatabase(name)
+            db.get_data(jib)
+            db.close()
+    results[f"{prefix}/get_data"] = timed(get_uncached) / len(lookups)
+
+    def get_cached():
+        for name, jib in lookups:
+            main.cached_crane_data(name, jib)
+    get_cached()
+    results[f"{prefix}/cached_get"] = timed(get_cached, repeat=3) / len(lookups)
+
+    start = time.perf_counter()
+    for name in names:
+        main.delete_crane_database(name)
+    results[f"{prefix}/delete_model"] = (time.perf_counter() - start) / models
+
+def bench_masts(results):
+    db = MastDatabase()
+    db.add_many([f"M{i}", 2.0, 3.0, 5.0] for i in range(1000))
+    db.close()
+
+    def get_masts():
+        for i in range(1000):
+            db = MastDatabase()
+            db.get_data(f"M{i}")
+            db.close()
+    results["mast/get_data"] = timed(get_masts) / 1000
+
+def bench_gui(results):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        print("PyQt5 not installed, skipping GUI benchmarks")
+        return
+    app = QApplication.instance() or QApplication([])
+    import gui
+
+    db = CraneDatabase("guibench")
+    db.add_many(synthetic_row(20.0 + 0.5 * i) for i in range(100))
+    db.close()
+
+    window = gui.MainWindow()
+
+    def click_and_wait(widget, handler):
+        handler()
+        while window.tasks.tasks:
+            window.tasks.wait(1)
+            app.processEvents()
+
+    crane = window.crane_window
+    crane.model_input.setText("guibench")
+    crane.retrieve_data()
+    crane.retrieve_data_widget.jib_length_input.setText("45.5")
+
+    def crane_retrieve():
+        for _ in range(100):
+            crane.retrieve_data_widget.set_model_name("guibench")
+            click_and_wait(crane, crane.retrieve_data_widget.retrieve_data)
+    results["gui/crane_retrieve"] = timed(crane_retrieve) / 100
+
+    mast = window.mast_window
+    mast.retrieve_data_widget.mast_model_input.setText("M1")
+
+    def mast_retrieve():
+        for _ in range(100):
+            click_and_wait(mast, mast.retrieve_data_widget.retrieve_data)
+    results["gui/mast_retrieve"] = timed(mast_retrieve) / 100
+    window.close()
+
+def bench_startup(results):
+    # Cold start of the GUI in a fresh interpreter, up to a running main menu
+    import subprocess
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, os.path.join(PACKAGE_DIR, "gui.py"), "--startup-check"],
+                               env=env, capture_output=True, text=True)
+    results["gui/startup"] = time.perf_counter() - start
+    if completed.returncode:
+        print(f"GUI startup over budget: {completed.stdout.strip()} {completed.stderr.strip()}")
+
+def compare(results, baseline):
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        before = baseline.get(name)
+        if before and seconds > before * (1 + TOLERANCE):
+            regressions.append((name, before, seconds))
+    return regressions
+
+def run(sizes, jib_lengths, gui):
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="crane_bench_")
+    cwd = os.getcwd()
+    # CraneDatabase and MastDatabase use paths relative to the working directory
+    os.chdir(work_dir)
+    try:
+        random.seed(1)
+        for models in sizes:
+            print(f"Benchmarking {models} models x {jib_lengths} jib lengths...")
+            bench_catalog(models, jib_lengths, results)
+        bench_masts(results)
+        if gui:
+            bench_gui(results)
+            bench_startup(results)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the crane/mast database layer and GUI retrieval.")
+    parser.add_argument("--sizes", default="10,1000", help="comma separated model counts, e.g. 10,1000,10000")
+    parser.add_argument("--jib-lengths", type=int, default=100)
+    parser.add_argument("--no-gui", action="store_true")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(",")], args.jib_lengths, not args.no_gui)
+    for name, seconds in sorted(results.items()):
+        print(f"{name:32s} {seconds * 1e6:12.1f} us")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1e6:.1f} us -> {after * 1e6:.1f} us")
+        sys.exit(1 if regressions else 0)
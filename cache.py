@@ -0,0 +1,51 @@
+import os
+import threading
+from collections import OrderedDict
+
+def file_signature(path):
+    # Changes whenever the database (or its WAL file) is written by any process
+    signature = []
+    for name in (path, path + "-wal"):
+        try:
+            st = os.stat(name)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+class TableCache:
+    # Process-wide LRU of whole tables, keyed by database file path
+    def __init__(self, max_tables=64):
+        self.max_tables = max_tables
+        self.tables = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_table(self, path, load, kind="table"):
+        # load() is only called on a miss or after the file changed on disk.
+        # kind lets several views of the same file (rows, indexes) share its invalidation
+        key = (path, kind)
+        signature = file_signature(path)
+        with self.lock:
+            entry = self.tables.get(key)
+            if entry is not None and entry[0] == signature:
+                self.tables.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        table = load()
+        with self.lock:
+            self.misses += 1
+            self.tables[key] = (signature, table)
+            self.tables.move_to_end(key)
+            while len(self.tables) > self.max_tables:
+                self.tables.popitem(last=False)
+        return table
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self.tables.clear()
+            else:
+                for key in [key for key in self.tables if key[0] == path]:
+                    del self.tables[key]
@@ -0,0 +1,155 @@
+import os
+import sys
+import glob
+from main import CRANE_FIELDS, connect, normalize_model_name, validate_crane_row, validate_rows
+
+CATALOG_PATH = "CraneData/crane_catalog.db"
+
+class CraneCatalog:
+    # Single-file alternative to one CraneData/<model>_crane.db per model
+    def __init__(self, db_name=CATALOG_PATH):
+        self.db_name = db_name
+        os.makedirs(os.path.dirname(db_name) or '.', exist_ok=True)
+        self.conn = connect(self.db_name)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.cursor = self.conn.cursor()
+        self.create_tables()
+
+    def create_tables(self):
+        columns = ",\n".join(f"            {field} REAL" for field in CRANE_FIELDS[1:])
+        self.cursor.executescript(f'''
+        CREATE TABLE IF NOT EXISTS crane_models (
+            model_id INTEGER PRIMARY KEY,
+            model_name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS crane_data (
+            model_id INTEGER NOT NULL REFERENCES crane_models(model_id) ON DELETE CASCADE,
+            jib_length REAL NOT NULL,
+{columns},
+            PRIMARY KEY (model_id, jib_length)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_crane_data_tip_load ON crane_data (tip_load, max_load_radius);
+        CREATE INDEX IF NOT EXISTS idx_crane_data_radius ON crane_data (max_load_radius, tip_load);
+        ''')
+        self.conn.commit()
+
+    def model_id(self, model_name, create=False):
+        name = normalize_model_name(model_name)
+        row = self.cursor.execute('SELECT model_id FROM crane_models WHERE model_name = ?', (name,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        self.cursor.execute('INSERT INTO crane_models (model_name) VALUES (?)', (name,))
+        return self.cursor.lastrowid
+
+    def add_model(self, model_name):
+        model_id = self.model_id(model_name, create=True)
+        self.conn.commit()
+        return model_id
+
+    def models(self):
+        return [row[0] for row in self.cursor.execute('SELECT model_name FROM crane_models ORDER BY model_name')]
+
+    def delete_model(self, model_name):
+        with self.conn:
+            self.cursor.execute('DELETE FROM crane_models WHERE model_name = ?', (normalize_model_name(model_name),))
+        return self.cursor.rowcount > 0
+
+    def add_data(self, model_name, *values):
+        self.add_many(model_name, [values])
+
+    def add_many(self, model_name, rows):
+        checked = validate_rows(rows, validate_crane_row)
+        placeholders = ", ".join("?" for _ in range(len(CRANE_FIELDS) + 1))
+        with self.conn:
+            model_id = self.model_id(model_name, create=True)
+            self.cursor.executemany(f'''
+            INSERT OR REPLACE INTO crane_data (model_id, {", ".join(CRANE_FIELDS)}) VALUES ({placeholders})
+            ''', [(model_id,) + row for row in checked])
+        return len(checked)
+
+    def get_data(self, model_name, jib_length):
+        self.cursor.execute(f'''
+        SELECT {", ".join(CRANE_FIELDS)} FROM crane_data
+        JOIN crane_models USING (model_id)
+        WHERE model_name = ? AND jib_length = ?
+        ''', (normalize_model_name(model_name), jib_length))
+        return self.cursor.fetchone()
+
+    def get_model_data(self, model_name):
+        self.cursor.execute(f'''
+        SELECT {", ".join(CRANE_FIELDS)} FROM crane_data
+        JOIN crane_models USING (model_id)
+        WHERE model_name = ? ORDER BY jib_length
+        ''', (normalize_model_name(model_name),))
+        return self.cursor.fetchall()
+
+    def find_cranes(self, min_tip_load=None, min_radius=None):
+        # Rows are (model_name, jib_length, ..., delta_h) across every model in the catalog
+        conditions = []
+        params = []
+        if min_tip_load is not None:
+            conditions.append("tip_load >= ?")
+            params.append(min_tip_load)
+        if min_radius is not None:
+            conditions.append("max_load_radius >= ?")
+            params.append(min_radius)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        self.cursor.execute(f'''
+        SELECT model_name, {", ".join("d." + field for field in CRANE_FIELDS)}
+        FROM crane_data d JOIN crane_models USING (model_id)
+        {where}
+        ORDER BY model_name, jib_length
+        ''', params)
+        return self.cursor.fetchall()
+
+    def import_model_file(self, path):
+        # Copies one legacy per-model database into the catalog; returns the row count
+        model_name = os.path.basename(path)[:-len("_crane.db")]
+        source = connect(path, read_only=True)
+        try:
+            existing = {row[1] for row in source.execute('PRAGMA table_info(crane_data)')}
+            if not existing:
+                rows = []
+            else:
+                # A crane_data table created by the DDL with the missing comma has no
+                # number_of_falls column; it is imported as NULL
+                columns = [field if field in existing else "NULL" for field in CRANE_FIELDS]
+                rows = source.execute(f'SELECT {", ".join(columns)} FROM crane_data').fetchall()
+        finally:
+            source.close()
+        placeholders = ", ".join("?" for _ in range(len(CRANE_FIELDS) + 1))
+        with self.conn:
+            model_id = self.model_id(model_name, create=True)
+            self.cursor.executemany(f'''
+            INSERT OR REPLACE INTO crane_data (model_id, {", ".join(CRANE_FIELDS)}) VALUES ({placeholders})
+            ''', [(model_id,) + tuple(row) for row in rows])
+        return len(rows)
+
+    def migrate(self, directory="CraneData"):
+        # Returns {model_name: rows imported}
+        results = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*_crane.db"))):
+            model_name = os.path.basename(path)[:-len("_crane.db")]
+            results[model_name] = self.import_model_file(path)
+        return results
+
+    def close(self):
+        self.conn.close()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("migrate", "find"):
+        print("Usage: python catalog.py migrate [CraneData directory]")
+        print("       python catalog.py find <min tip load> <min radius>")
+        sys.exit(2)
+    catalog = CraneCatalog()
+    if sys.argv[1] == "migrate":
+        results = catalog.migrate(sys.argv[2] if len(sys.argv) > 2 else "CraneData")
+        for model_name, count in results.items():
+            print(f"{model_name}: {count} rows")
+        print(f"Migrated {len(results)} models into {catalog.db_name}.")
+    else:
+        for row in catalog.find_cranes(float(sys.argv[2]), float(sys.argv[3])):
+            print(row)
+    catalog.close()
@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from functools import partial
+from main import (CRANE_FIELDS, MAST_FIELDS, CraneDatabase, MastDatabase, cached_crane_data, cached_mast_table,
+                  crane_db_path, create_crane_database, delete_crane_database, list_crane_models, validate_crane_row)
+
+def crane_record(row):
+    return dict(zip(CRANE_FIELDS, row)) if row else None
+
+def mast_record(row):
+    return dict(zip(MAST_FIELDS, row)) if row else None
+
+class BatchSession:
+    # Executes JSON command lines, keeping one open connection per model.
+    # Consecutive adds to a model are buffered and written in one transaction.
+    def __init__(self):
+        self.cranes = {}
+        self.pending = {}
+        self.mast_db = None
+        self.pending_masts = []
+        self.lost = {}
+
+    def crane_db(self, model_name):
+        if model_name not in self.cranes:
+            self.cranes[model_name] = CraneDatabase(model_name)
+        return self.cranes[model_name]
+
+    def masts(self):
+        if self.mast_db is None:
+            self.mast_db = MastDatabase()
+        return self.mast_db
+
+    def flush(self):
+        # Writes every buffered group in its own transaction. A group that fails is
+        # dropped; its add lines are kept in self.lost as {line: error} to report.
+        groups = [(partial(self.crane_db, name), rows) for name, rows in self.pending.items()]
+        if self.pending_masts:
+            groups.append((self.masts, self.pending_masts))
+        self.pending = {}
+        self.pending_masts = []
+        for database, rows in groups:
+            try:
+                database().add_many([row for _, row in rows])
+            except Exception as e:
+                self.lost.update((line, str(e)) for line, _ in rows)
+
+    def buffered(self):
+        return bool(self.pending or self.pending_masts)
+
+    def execute(self, command, line=None):
+        # Returns None for an add, which is only buffered; its outcome is known after flush()
+        op = command.get("op")
+        model = command.get("model")
+        if op in ("add", "add_mast") and not (isinstance(model, str) and model.strip()):
+            raise ValueError(f"{op} needs a model name")
+        if op == "add":
+            row = validate_crane_row(command["values"])
+            self.pending.setdefault(model, []).append((line, row))
+            return None
+        if op == "add_mast":
+            values = command["values"]
+            if len(values) != 3:
+                raise ValueError("a mast needs self weight, mast height and mast wind area")
+            self.pending_masts.append((line, (model,) + tuple(float(value) for value in values)))
+            return None
+        # Anything else may read what was just added
+        self.flush()
+        if op == "get":
+            if model not in self.cranes and not os.path.exists(crane_db_path(model)):
+                return {"ok": True, "data": None}
+            return {"ok": True, "data": crane_record(self.crane_db(model).get_data(float(command["jib_length"])))}
+        if op == "get_mast":
+            return {"ok": True, "data": mast_record(self.masts().get_data(model))}
+        if op == "create":
+            self.crane_db(model)
+            return {"ok": True}
+        if op == "delete":
+            db = self.cranes.pop(model, None)
+            if db:
+                db.close()
+            return {"ok": True, "deleted": delete_crane_database(model)}
+        if op == "resolve":
+            from tower_config import resolve
+            config = resolve(model, float(command["jib_length"]), command["mast_model"], int(command["sections"]))
+            return {"ok": True, "data": config.as_dict()}
+        if op == "list":
+            return {"ok": True, "models": list_crane_models()}
+        if op == "list_masts":
+            return {"ok": True, "masts": sorted(cached_mast_table())}
+        raise ValueError(f"Unknown op: {op!r}")
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for db in self.cranes.values():
+                db.close()
+            if self.mast_db:
+                self.mast_db.close()
+
+def run_batch(lines, out):
+    # Writes exactly one answer per input line, in input order, and returns the
+    # number of failed lines. An add is answered once its transaction has been
+    # written (at the next other command or the end of input), so ok means stored.
+    session = BatchSession()
+    answers = []
+    failures = 0
+
+    def write_answers():
+        nonlocal failures
+        for number, result in answers:
+            if result is None:
+                error = session.lost.pop(number, None)
+                result = {"ok": True} if error is None else {"ok": False, "line": number, "error": error}
+            if not result["ok"]:
+                failures += 1
+            out.write(json.dumps(result) + "\n")
+        answers.clear()
+    try:
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                result = session.execute(json.loads(line), number)
+            except Exception as e:
+                result = {"ok": False, "line": number, "error": str(e)}
+            answers.append((number, result))
+            if not session.buffered():
+                write_answers()
+        session.flush()
+        write_answers()
+    finally:
+        session.close()
+    return failures
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Crane and mast database tools. "
+                                     "Run without arguments for the interactive menu.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="create a crane model database")
+    create.add_argument("model")
+
+    add = commands.add_parser("add", help="add or replace one jib length (or mast with --mast)")
+    add.add_argument("--mast", action="store_true", help="add a mast: MODEL SELF_WEIGHT HEIGHT WIND_AREA")
+    add.add_argument("model")
+    add.add_argument("values", nargs="+", type=float)
+
+    get = commands.add_parser("get", help="print one jib length (or mast with --mast) as JSON")
+    get.add_argument("--mast", action="store_true")
+    get.add_argument("model")
+    get.add_argument("jib_length", nargs="?", type=float)
+
+    delete = commands.add_parser("delete", help="delete a crane model database")
+    delete.add_argument("model")
+
+    listing = commands.add_parser("list", help="list crane models (or masts with --mast)")
+    listing.add_argument("--mast", action="store_true")
+
+    load = commands.add_parser("import", help="import a CSV/Excel load chart")
+    load.add_argument("model")
+    load.add_argument("path")
+
+    export = commands.add_parser("export", help="export every database to a folder")
+    export.add_argument("format", choices=["csv", "xlsx", "parquet"])
+    export.add_argument("output_dir")
+
+    commands.add_parser("batch", help="read JSON command lines from stdin, write JSON results to stdout")
+    return parser
+
+def run(argv):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "create":
+            create_crane_database(args.model)
+            print(f"Database for {args.model} created successfully.")
+        elif args.command == "add" and args.mast:
+            if len(args.values) != 3:
+                raise ValueError("a mast needs self weight, mast height and mast wind area")
+            db = MastDatabase()
+            try:
+                db.add_many([[args.model] + args.values])
+            finally:
+                db.close()
+        elif args.command == "add":
+            db = CraneDatabase(args.model)
+            try:
+                db.add_many([args.values])
+            finally:
+                db.close()
+        elif args.command == "get" and args.mast:
+            print(json.dumps(mast_record(cached_mast_table().get(args.model))))
+        elif args.command == "get":
+            if args.jib_length is None:
+                raise ValueError("a jib length is required")
+            print(json.dumps(crane_record(cached_crane_data(args.model, args.jib_length))))
+        elif args.command == "delete":
+            if not delete_crane_database(args.model):
+                print(f"Database for {args.model} not found.")
+                return 1
+        elif args.command == "list":
+            print("\n".join(sorted(cached_mast_table()) if args.mast else list_crane_models()))
+        elif args.command == "import":
+            from load_chart import import_load_chart
+            count, seconds = import_load_chart(args.model, args.path)
+            print(f"Imported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
+        elif args.command == "export":
+            from export import export_all
+            count, seconds, errors = export_all(args.output_dir, args.format)
+            for out_path, error in errors.items():
+                print(f"Failed to export {out_path}: {error}", file=sys.stderr)
+            print(f"Exported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
+            return 1 if errors else 0
+        elif args.command == "batch":
+            return 1 if run_batch(sys.stdin, sys.stdout) else 0
+    except (OSError, ValueError, ImportError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
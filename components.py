@@ -0,0 +1,162 @@
+import os
+from main import connect, read_table, table_cache, validate_rows
+
+COMPONENT_DB = "ComponentData/components.db"
+
+class ComponentType:
+    # One kind of tower component, declared once. fields is a list of
+    # (name, unit) pairs; the first field is the text key, the rest are numbers.
+    def __init__(self, name, title, fields, weight_field=None):
+        self.name = name
+        self.title = title
+        self.fields = fields
+        self.weight_field = weight_field
+        self.key = fields[0][0]
+        self.columns = [field for field, _ in fields]
+        self.table = f"component_{name}"
+        # Built once so sqlite3's statement cache reuses the compiled statements
+        self.insert_sql = (f"INSERT OR REPLACE INTO {self.table} ({', '.join(self.columns)}) "
+                           f"VALUES ({', '.join('?' for _ in self.columns)})")
+        self.select_sql = f"SELECT {', '.join(self.columns)} FROM {self.table} WHERE {self.key} = ?"
+        self.delete_sql = f"DELETE FROM {self.table} WHERE {self.key} = ?"
+
+    def create_sql(self):
+        columns = [f"{self.key} TEXT PRIMARY KEY"] + [f"{field} REAL" for field in self.columns[1:]]
+        return f"CREATE TABLE IF NOT EXISTS {self.table} ({', '.join(columns)})"
+
+    def validate(self, record):
+        # Accepts a dict or a sequence in field order; returns a tuple in field order
+        if isinstance(record, dict):
+            missing = [field for field in self.columns if field not in record]
+            if missing:
+                raise ValueError(f"{self.title} is missing {', '.join(missing)}")
+            values = [record[field] for field in self.columns]
+        else:
+            values = list(record)
+            if len(values) != len(self.columns):
+                raise ValueError(f"{self.title} needs {len(self.columns)} values, got {len(values)}")
+        key = str(values[0]).strip()
+        if not key:
+            raise ValueError(f"{self.title} needs a {self.key.replace('_', ' ')}")
+        result = [key]
+        for (field, _), value in zip(self.fields[1:], values[1:]):
+            try:
+                result.append(float(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"{field} is not a number: {value!r}")
+        return tuple(result)
+
+COMPONENT_TYPES = {}
+
+def register(component_type):
+    COMPONENT_TYPES[component_type.name] = component_type
+    return component_type
+
+register(ComponentType("climbing_cage", "Climbing cage", [
+    ("cage_model", ""), ("self_weight", "t"), ("height", "m"), ("wind_area", "m2"), ("max_mast_width", "m"),
+], weight_field="self_weight"))
+
+register(ComponentType("foundation", "Foundation (base ballast)", [
+    ("foundation_model", ""), ("base_width", "m"), ("base_length", "m"), ("depth", "m"),
+    ("ballast_weight", "t"), ("concrete_volume", "m3"),
+], weight_field="ballast_weight"))
+
+register(ComponentType("anchorage", "Anchorage", [
+    ("anchorage_model", ""), ("self_weight", "t"), ("max_tie_force", "kN"), ("min_distance", "m"),
+    ("max_distance", "m"),
+], weight_field="self_weight"))
+
+register(ComponentType("crane_part", "Crane component", [
+    ("part_number", ""), ("self_weight", "t"), ("length", "m"), ("width", "m"), ("height", "m"),
+], weight_field="self_weight"))
+
+class ComponentDatabase:
+    # All component types share one SQLite file
+    def __init__(self, db_name=COMPONENT_DB):
+        self.db_name = db_name
+        os.makedirs(os.path.dirname(db_name) or '.', exist_ok=True)
+        self.conn = connect(self.db_name)
+        self.cursor = self.conn.cursor()
+        self.create_tables()
+
+    def create_tables(self):
+        statements = [component_type.create_sql() for component_type in COMPONENT_TYPES.values()]
+        statements.append('''
+        CREATE TABLE IF NOT EXISTS tower_bill (
+            tower_name TEXT NOT NULL,
+            component_type TEXT NOT NULL,
+            component_key TEXT NOT NULL,
+            quantity REAL NOT NULL,
+            PRIMARY KEY (tower_name, component_type, component_key)
+        )''')
+        statements.append("CREATE INDEX IF NOT EXISTS idx_tower_bill_component "
+                          "ON tower_bill (component_type, component_key)")
+        with self.conn:
+            for statement in statements:
+                self.cursor.execute(statement)
+
+    def add_data(self, type_name, record):
+        self.add_many(type_name, [record])
+
+    def add_many(self, type_name, records):
+        component_type = COMPONENT_TYPES[type_name]
+        checked = validate_rows(records, component_type.validate)
+        with self.conn:
+            self.cursor.executemany(component_type.insert_sql, checked)
+        table_cache.invalidate(self.db_name)
+        return len(checked)
+
+    def get_data(self, type_name, key):
+        self.cursor.execute(COMPONENT_TYPES[type_name].select_sql, (key,))
+        return self.cursor.fetchone()
+
+    def delete_data(self, type_name, key):
+        with self.conn:
+            self.cursor.execute(COMPONENT_TYPES[type_name].delete_sql, (key,))
+        table_cache.invalidate(self.db_name)
+        return self.cursor.rowcount > 0
+
+    def list_keys(self, type_name):
+        component_type = COMPONENT_TYPES[type_name]
+        return [row[0] for row in self.cursor.execute(
+            f"SELECT {component_type.key} FROM {component_type.table} ORDER BY {component_type.key}")]
+
+    def set_bill(self, tower_name, items):
+        # items: [(component_type, component_key, quantity), ...] replaces the tower's bill
+        for type_name, _, _ in items:
+            if type_name not in COMPONENT_TYPES:
+                raise ValueError(f"Unknown component type: {type_name}")
+        with self.conn:
+            self.cursor.execute("DELETE FROM tower_bill WHERE tower_name = ?", (tower_name,))
+            self.cursor.executemany("INSERT OR REPLACE INTO tower_bill VALUES (?, ?, ?, ?)",
+                                    [(tower_name, t, str(k), float(q)) for t, k, q in items])
+        table_cache.invalidate(self.db_name)
+
+    def bill(self, tower_name):
+        # One query over every component table:
+        # (component_type, component_key, quantity, unit_weight, total_weight);
+        # weights are None for components that are not in the database
+        parts = []
+        for component_type in COMPONENT_TYPES.values():
+            weight = f"c.{component_type.weight_field}" if component_type.weight_field else "NULL"
+            parts.append(f'''
+            SELECT b.component_type, b.component_key, b.quantity, {weight}, b.quantity * {weight}
+            FROM tower_bill b LEFT JOIN {component_type.table} c ON c.{component_type.key} = b.component_key
+            WHERE b.tower_name = ? AND b.component_type = '{component_type.name}'
+            ''')
+        sql = " UNION ALL ".join(parts) + " ORDER BY 1, 2"
+        return self.cursor.execute(sql, [tower_name] * len(parts)).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+def cached_component_table(type_name, db_name=COMPONENT_DB):
+    # {key: row} for one component type, shared with the crane/mast table cache
+    if not os.path.exists(db_name):
+        return {}
+    component_type = COMPONENT_TYPES[type_name]
+    query = f"SELECT {', '.join(component_type.columns)} FROM {component_type.table}"
+    return table_cache.get_table(db_name, lambda: read_table(db_name, query), kind=f"component:{type_name}")
+
+def cached_component_data(type_name, key, db_name=COMPONENT_DB):
+    return cached_component_table(type_name, db_name).get(key)
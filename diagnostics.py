@@ -0,0 +1,188 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+import main
+
+# Methods timed on each database class. Nothing is wrapped or hooked until
+# enable() is called, so a disabled build runs the original methods and
+# main.connect/main.read_table only pay one check of main.profiler.
+OPERATIONS = ["__init__", "create_table", "add_data", "add_many", "get_data", "close"]
+SLOW_THRESHOLD = 0.05
+BUCKETS = 24
+# Statements kept per operation for the slow-query log
+MAX_STATEMENTS = 20
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # Bucket i counts calls that took under 2**i microseconds
+            self.histograms = {}
+            self.totals = {}
+            self.maxima = {}
+            self.connections = 0
+            self.commits = 0
+            self.statements = 0
+            self.slow_queries = deque(maxlen=200)
+
+    def record(self, operation, seconds, statements):
+        bucket = min(max(int(seconds * 1e6), 1).bit_length(), BUCKETS - 1)
+        with self.lock:
+            histogram = self.histograms.setdefault(operation, [0] * BUCKETS)
+            histogram[bucket] += 1
+            self.totals[operation] = self.totals.get(operation, 0.0) + seconds
+            self.maxima[operation] = max(self.maxima.get(operation, 0.0), seconds)
+            if seconds >= SLOW_THRESHOLD:
+                self.slow_queries.append({"operation": operation, "seconds": seconds,
+                                          "time": time.strftime("%Y-%m-%d %H:%M:%S"), "statements": statements})
+
+    def trace(self, statement):
+        # sqlite3 trace callback; COMMIT also shows up here for conn.commit() and `with conn`
+        if main.profiler is None:
+            return
+        with self.lock:
+            self.statements += 1
+            if statement.lstrip().upper().startswith("COMMIT"):
+                self.commits += 1
+        current = getattr(self.local, "statements", None)
+        if current is not None and len(current) < MAX_STATEMENTS:
+            current.append(statement.strip())
+
+    def percentile(self, operation, fraction):
+        # Upper bound, in seconds, of the histogram bucket holding the percentile
+        histogram = self.histograms[operation]
+        target = sum(histogram) * fraction
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if seen >= target:
+                return min(2 ** bucket / 1e6, self.maxima[operation])
+        return self.maxima[operation]
+
+    def snapshot(self):
+        with self.lock:
+            operations = {}
+            for operation, histogram in sorted(self.histograms.items()):
+                count = sum(histogram)
+                operations[operation] = {
+                    "count": count,
+                    "mean": self.totals[operation] / count,
+                    "p50": self.percentile(operation, 0.5),
+                    "p95": self.percentile(operation, 0.95),
+                    "max": self.maxima[operation],
+                    "histogram_us": {f"<{2 ** i}": n for i, n in enumerate(histogram) if n},
+                }
+            return {"operations": operations, "connections_opened": self.connections,
+                    "commits": self.commits, "statements": self.statements,
+                    "slow_queries": list(self.slow_queries)}
+
+stats = Stats()
+originals = {}
+
+def call_timed(operation, function, *args, **kwargs):
+    outer = getattr(stats.local, "statements", None)
+    stats.local.statements = statements = []
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        stats.record(operation, time.perf_counter() - start, statements)
+        if outer is not None:
+            outer.extend(statements[:MAX_STATEMENTS - len(outer)])
+        stats.local.statements = outer
+
+def timed(operation, method):
+    def wrapper(*args, **kwargs):
+        return call_timed(operation, method, *args, **kwargs)
+    return wrapper
+
+class Profiler:
+    # Installed as main.profiler; main.connect and main.read_table call into it, so
+    # modules that imported those functions directly are recorded too
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.traced = []
+
+    def call(self, operation, function, *args, **kwargs):
+        return call_timed(operation, function, *args, **kwargs)
+
+    def connect(self, open_connection, *args, **kwargs):
+        conn = call_timed("connect", open_connection, *args, **kwargs)
+        conn.set_trace_callback(stats.trace)
+        with stats.lock:
+            stats.connections += 1
+        with self.lock:
+            if len(self.traced) >= 256:
+                self.traced = [traced for traced in self.traced if is_open(traced)]
+            self.traced.append(conn)
+        return conn
+
+    def untrace(self):
+        # A connection owned by another thread cannot be changed from here; its
+        # callback stays but stats.trace returns at once while disabled
+        with self.lock:
+            traced, self.traced = self.traced, []
+        for conn in traced:
+            try:
+                conn.set_trace_callback(None)
+            except sqlite3.ProgrammingError:
+                pass
+
+def is_open(conn):
+    try:
+        conn.in_transaction
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+def enabled():
+    return main.profiler is not None
+
+def enable():
+    if main.profiler is not None:
+        return
+    for cls in (main.CraneDatabase, main.MastDatabase):
+        for name in OPERATIONS:
+            method = cls.__dict__.get(name)
+            if method is None:
+                continue
+            originals[(cls, name)] = method
+            setattr(cls, name, timed(f"{cls.__name__}.{name}", method))
+    main.profiler = Profiler()
+
+def disable():
+    profiler, main.profiler = main.profiler, None
+    for (owner, name), method in originals.items():
+        setattr(owner, name, method)
+    originals.clear()
+    if profiler is not None:
+        profiler.untrace()
+
+def report():
+    data = stats.snapshot()
+    lines = [f"Connections opened: {data['connections_opened']}",
+             f"Commits: {data['commits']}",
+             f"Statements: {data['statements']}",
+             "",
+             f"{'Operation':34s} {'count':>7s} {'mean ms':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'max ms':>9s}"]
+    for operation, values in data["operations"].items():
+        lines.append(f"{operation:34s} {values['count']:7d} {values['mean'] * 1e3:9.3f} "
+                     f"{values['p50'] * 1e3:9.3f} {values['p95'] * 1e3:9.3f} {values['max'] * 1e3:9.3f}")
+    if data["slow_queries"]:
+        lines.append("")
+        lines.append(f"Slow operations (>= {SLOW_THRESHOLD * 1e3:.0f} ms):")
+        for entry in data["slow_queries"]:
+            lines.append(f"{entry['time']} {entry['operation']} {entry['seconds'] * 1e3:.1f} ms")
+            for statement in entry["statements"]:
+                lines.append(f"    {' '.join(statement.split())}")
+    return "\n".join(lines)
+
+def dump(path):
+    with open(path, "w") as f:
+        json.dump(stats.snapshot(), f, indent=2)
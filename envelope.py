@@ -0,0 +1,96 @@
+import numpy as np
+from main import CRANE_FIELDS, cached_mast_table
+from jib_index import crane_jib_index
+
+# Column positions in a crane_data row
+JIB = CRANE_FIELDS.index("jib_length")
+IN_M = CRANE_FIELDS.index("in_service_moment")
+IN_V = CRANE_FIELDS.index("in_service_vertical_force")
+IN_H = CRANE_FIELDS.index("in_service_horizontal_force")
+OUT_M = CRANE_FIELDS.index("out_of_service_moment")
+OUT_V = CRANE_FIELDS.index("out_of_service_vertical_force")
+OUT_H = CRANE_FIELDS.index("out_of_service_horizontal_force")
+
+# Defaults assume crane reactions in kN / kNm, mast self weight in t and
+# mast wind area in m2 per section; pass other values for other units
+GRAVITY = 9.81
+IN_SERVICE_PRESSURE = 0.25
+OUT_OF_SERVICE_PRESSURE = 1.1
+
+class ReactionGrid:
+    # Foundation reactions for every jib length x mast model x section count.
+    # Each array has shape (jib lengths, mast models, section counts).
+    def __init__(self, jib_lengths, mast_models, sections, in_service, out_of_service):
+        self.jib_lengths = jib_lengths
+        self.mast_models = mast_models
+        self.sections = sections
+        self.in_service = in_service
+        self.out_of_service = out_of_service
+
+    def governing(self, state="in_service"):
+        # The combination with the largest foundation moment for a service state
+        moment, vertical, horizontal = getattr(self, state)
+        if not moment.size or np.isnan(moment).all():
+            return None
+        i, j, k = np.unravel_index(np.nanargmax(moment), moment.shape)
+        return {
+            "jib_length": float(self.jib_lengths[i]),
+            "mast_model": self.mast_models[j],
+            "sections": int(self.sections[k]),
+            "moment": float(moment[i, j, k]),
+            "vertical_force": float(vertical[i, j, k]),
+            "horizontal_force": float(horizontal[i, j, k]),
+        }
+
+    def envelope(self, state="in_service"):
+        # Largest moment, vertical and horizontal force over all jib lengths,
+        # per (mast model, section count)
+        moment, vertical, horizontal = getattr(self, state)
+        return np.nanmax(moment, axis=0), np.nanmax(vertical, axis=0), np.nanmax(horizontal, axis=0)
+
+def compute_reactions(crane_values, mast_values, sections, gravity=GRAVITY,
+                      in_service_pressure=IN_SERVICE_PRESSURE, out_of_service_pressure=OUT_OF_SERVICE_PRESSURE):
+    # crane_values: (J, 12) crane_data rows; mast_values: (K, 3) self_weight,
+    # mast_height, mast_wind_area per section; sections: (S,) section counts
+    crane = np.asarray(crane_values, dtype=float)[:, None, None, :]
+    mast = np.asarray(mast_values, dtype=float)[None, :, None, :]
+    n = np.asarray(sections, dtype=float)[None, None, :]
+
+    weight = mast[..., 0] * n * gravity
+    height = mast[..., 1] * n
+    area = mast[..., 2] * n
+
+    results = []
+    for m, v, h, pressure in ((IN_M, IN_V, IN_H, in_service_pressure),
+                              (OUT_M, OUT_V, OUT_H, out_of_service_pressure)):
+        # Mast wind acts as a uniform load, resultant at half the mast height
+        wind = pressure * area
+        horizontal = crane[..., h] + wind
+        moment = crane[..., m] + crane[..., h] * height + wind * height / 2
+        vertical = crane[..., v] + weight
+        results.append((moment, vertical, horizontal))
+    return results
+
+def foundation_reactions(model_name, mast_models=None, sections=range(1, 21), jib_lengths=None, **kwargs):
+    # jib_lengths defaults to every stored jib length; other values are interpolated
+    index = crane_jib_index(model_name)
+    if jib_lengths is None:
+        keys, crane_values = index.as_arrays()
+    else:
+        crane_values = index.interpolate_many(jib_lengths)
+        keys = crane_values[:, JIB]
+    masts = cached_mast_table()
+    if mast_models is None:
+        mast_models = sorted(masts)
+    missing = [name for name in mast_models if name not in masts]
+    if missing:
+        raise ValueError(f"Unknown mast models: {', '.join(missing)}")
+    mast_values = np.array([masts[name][1:4] for name in mast_models], dtype=float).reshape(len(mast_models), 3)
+    sections = np.asarray(list(sections), dtype=int)
+    in_service, out_of_service = compute_reactions(crane_values, mast_values, sections, **kwargs)
+    return ReactionGrid(keys, list(mast_models), sections, in_service, out_of_service)
+
+def foundation_envelope(model_name, mast_models=None, sections=range(1, 21), jib_lengths=None, **kwargs):
+    # Governing in-service and out-of-service reactions over the whole grid
+    grid = foundation_reactions(model_name, mast_models, sections, jib_lengths, **kwargs)
+    return grid.governing("in_service"), grid.governing("out_of_service")
@@ -0,0 +1,140 @@
+import csv
+import glob
+import itertools
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from main import CRANE_FIELDS, MAST_FIELDS, MastDatabase, connect
+
+FORMATS = {"csv": ".csv", "xlsx": ".xlsx", "parquet": ".parquet"}
+CHUNK_SIZE = 5000
+
+def iter_chunks(db_name, table, columns, chunk_size=CHUNK_SIZE):
+    conn = connect(db_name, read_only=True)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+def write_csv(chunks, columns, out_path):
+    count = 0
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+def write_xlsx(chunks, columns, out_path, sheet_name):
+    # write_only workbooks stream rows to disk instead of building the sheet in memory
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name[:31])
+    sheet.append(columns)
+    count = 0
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+        count += len(rows)
+    workbook.save(out_path)
+    return count
+
+def write_parquet(chunks, columns, out_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([(column, pa.string() if column == "mast_model" else pa.float64()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(out_path, schema) as writer:
+        for rows in chunks:
+            batch = pa.record_batch([pa.array(values, type=field.type)
+                                     for values, field in zip(zip(*rows), schema)], schema=schema)
+            writer.write_batch(batch)
+            count += len(rows)
+    return count
+
+def export_table(db_name, table, columns, out_path, fmt, chunk_size=CHUNK_SIZE):
+    # Returns the number of rows written. The first chunk is read before the output
+    # file is opened so a table that cannot be read leaves no partial file behind.
+    chunks = iter_chunks(db_name, table, columns, chunk_size)
+    first = next(chunks, None)
+    chunks = itertools.chain([first] if first else [], chunks)
+    if fmt == "csv":
+        return write_csv(chunks, columns, out_path)
+    if fmt == "xlsx":
+        return write_xlsx(chunks, columns, out_path, os.path.splitext(os.path.basename(out_path))[0])
+    if fmt == "parquet":
+        return write_parquet(chunks, columns, out_path)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+def check_format(fmt):
+    # Fails early, in the calling process, when the writer library is missing
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "xlsx":
+        import openpyxl
+    elif fmt == "parquet":
+        import pyarrow.parquet
+
+def export_jobs(output_dir, fmt):
+    check_format(fmt)
+    jobs = []
+    for db_name in sorted(glob.glob("CraneData/*_crane.db")):
+        name = os.path.basename(db_name)[:-len(".db")]
+        jobs.append((db_name, "crane_data", CRANE_FIELDS, os.path.join(output_dir, name + FORMATS[fmt]), fmt))
+    if os.path.exists(MastDatabase.db_name):
+        jobs.append((MastDatabase.db_name, "mast_data", MAST_FIELDS,
+                     os.path.join(output_dir, "mast_data" + FORMATS[fmt]), fmt))
+    return jobs
+
+def _export_job(job):
+    try:
+        return job[3], export_table(*job), None
+    except sqlite3.Error as e:
+        return job[3], 0, str(e)
+
+def export_all(output_dir, fmt="csv", workers=None, progress=None):
+    # Exports every model database to output_dir, one file each, in parallel.
+    # Returns (total rows, seconds, {output path: error}); progress(done, total) is
+    # called as files complete.
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = export_jobs(output_dir, fmt)
+    total = 0
+    errors = {}
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_export_job, job) for job in jobs]
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                out_path, count, error = future.result()
+                total += count
+                if error:
+                    errors[out_path] = error
+                if progress:
+                    progress(done, len(jobs))
+        except BaseException:
+            # progress() raises to cancel; drop the files not started yet
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return total, time.perf_counter() - start, errors
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] not in FORMATS:
+        print(f"Usage: python export.py <{'|'.join(FORMATS)}> <output directory>")
+        sys.exit(2)
+    try:
+        count, seconds, errors = export_all(sys.argv[2], sys.argv[1])
+    except ImportError as e:
+        print(f"Export to {sys.argv[1]} needs an extra package: {e}")
+        sys.exit(1)
+    for out_path, error in errors.items():
+        print(f"Failed to export {out_path}: {error}")
+    print(f"Exported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
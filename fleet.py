@@ -0,0 +1,135 @@
+import math
+import sys
+import threading
+import time
+import numpy as np
+from cache import file_signature
+from envelope import IN_M, IN_V, IN_H, OUT_M, OUT_V, OUT_H, compute_reactions
+from load_pack import read_model_rows
+from main import CRANE_FIELDS, cached_mast_table, crane_db_path, list_crane_models, normalize_model_name
+
+TIP_LOAD = CRANE_FIELDS.index("tip_load")
+RADIUS = CRANE_FIELDS.index("max_load_radius")
+
+class FleetTable:
+    # Every model's crane_data rows as one columnar table: values is (rows, 12) and
+    # model_codes[i] indexes names for row i. refresh() reloads only the model files
+    # whose signature changed, then re-concatenates.
+    def __init__(self):
+        self.segments = {}
+        self.names = []
+        self.model_codes = np.empty(0, dtype=np.int32)
+        self.values = np.empty((0, len(CRANE_FIELDS)))
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        # Returns the number of model files (re)loaded or dropped
+        with self.lock:
+            models = list_crane_models()
+            changed = 0
+            for model_name in set(self.segments) - set(models):
+                del self.segments[model_name]
+                changed += 1
+            for model_name in models:
+                path = crane_db_path(model_name)
+                signature = file_signature(path)
+                segment = self.segments.get(model_name)
+                if segment is None or segment[0] != signature:
+                    self.segments[model_name] = (signature, read_model_rows(path))
+                    changed += 1
+            if changed:
+                self.names = sorted(self.segments)
+                blocks = [self.segments[name][1] for name in self.names]
+                self.values = np.concatenate(blocks) if blocks else np.empty((0, len(CRANE_FIELDS)))
+                self.model_codes = np.repeat(np.arange(len(self.names), dtype=np.int32),
+                                             [len(block) for block in blocks])
+            return changed
+
+    def select(self, min_tip_load=None, min_radius=None, models=None):
+        # Row positions of jib lengths that reach the radius and carry the tip load
+        self.refresh()
+        mask = np.ones(len(self.values), dtype=bool)
+        if min_tip_load is not None:
+            mask &= self.values[:, TIP_LOAD] >= min_tip_load
+        if min_radius is not None:
+            mask &= self.values[:, RADIUS] >= min_radius
+        if models is not None:
+            models = [normalize_model_name(name) for name in models]
+            missing = [name for name in models if name not in self.segments]
+            if missing:
+                raise ValueError(f"Unknown crane models: {', '.join(missing)}")
+            mask &= np.isin(self.model_codes, [self.names.index(name) for name in models])
+        return np.flatnonzero(mask)
+
+    def rank(self, min_tip_load=None, min_radius=None, height=None, mast_models=None, top=10, models=None, **kwargs):
+        # Smallest governing foundation moment first. Without a height the crane's own
+        # reactions are ranked; with one, every matching row is combined with each mast
+        # model at the section count that reaches that height.
+        rows = self.select(min_tip_load, min_radius, models)
+        values = self.values[rows]
+        codes = self.model_codes[rows]
+        if height is None:
+            moment = np.fmax(values[:, IN_M], values[:, OUT_M])
+            order = top_k(moment, top)
+            return [self.result(codes[i], values[i], moment[i],
+                                np.fmax(values[i, IN_V], values[i, OUT_V]),
+                                np.fmax(values[i, IN_H], values[i, OUT_H])) for i in order]
+
+        masts = cached_mast_table()
+        mast_models = sorted(masts) if mast_models is None else list(mast_models)
+        missing = [name for name in mast_models if name not in masts]
+        if missing:
+            raise ValueError(f"Unknown mast models: {', '.join(missing)}")
+        mast_values = np.array([masts[name][1:4] for name in mast_models], dtype=float).reshape(len(mast_models), 3)
+        sections = np.array([max(1, math.ceil(height / mast_height - 1e-9)) for mast_height in mast_values[:, 1]])
+        # Scaling each mast by its own section count lets one call cover every mast
+        in_service, out_of_service = compute_reactions(values, mast_values * sections[:, None], [1], **kwargs)
+        moment = np.fmax(in_service[0], out_of_service[0])[..., 0]
+        vertical = np.fmax(in_service[1], out_of_service[1])[..., 0]
+        horizontal = np.fmax(in_service[2], out_of_service[2])[..., 0]
+        results = []
+        for flat in top_k(moment.ravel(), top):
+            i, k = np.unravel_index(flat, moment.shape)
+            result = self.result(codes[i], values[i], moment[i, k], vertical[i, k], horizontal[i, k])
+            result.update(mast_model=mast_models[k], sections=int(sections[k]),
+                          tower_height=float(mast_values[k, 1] * sections[k]))
+            results.append(result)
+        return results
+
+    def result(self, code, row, moment, vertical, horizontal):
+        return {"model": self.names[code], "jib_length": float(row[0]), "tip_load": float(row[TIP_LOAD]),
+                "max_load_radius": float(row[RADIUS]), "moment": float(moment),
+                "vertical_force": float(vertical), "horizontal_force": float(horizontal)}
+
+def top_k(scores, k):
+    # Positions of the k smallest scores in ascending order, NaN last and never chosen
+    valid = np.flatnonzero(~np.isnan(scores))
+    if k is None or k >= len(valid):
+        return valid[np.argsort(scores[valid], kind="stable")]
+    part = valid[np.argpartition(scores[valid], k)[:k]]
+    return part[np.argsort(scores[part], kind="stable")]
+
+fleet = FleetTable()
+
+def rank_fleet(min_tip_load=None, min_radius=None, height=None, mast_models=None, top=10, models=None, **kwargs):
+    return fleet.rank(min_tip_load, min_radius, height, mast_models, top, models, **kwargs)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4, 5):
+        print("Usage: python fleet.py <min tip load> <min radius> [<tower height>] [<top>]")
+        sys.exit(2)
+    start = time.perf_counter()
+    loaded = fleet.refresh()
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    results = rank_fleet(float(sys.argv[1]), float(sys.argv[2]),
+                         float(sys.argv[3]) if len(sys.argv) > 3 else None,
+                         top=int(sys.argv[4]) if len(sys.argv) > 4 else 10)
+    ranked = time.perf_counter() - start
+    for result in results:
+        mast = f" / {result['mast_model']} x {result['sections']}" if "mast_model" in result else ""
+        print(f"{result['model']} @ {result['jib_length']} m{mast}: moment {result['moment']:.1f}, "
+              f"vertical {result['vertical_force']:.1f}, horizontal {result['horizontal_force']:.1f} "
+              f"(tip load {result['tip_load']}, radius {result['max_load_radius']})")
+    print(f"Loaded {len(fleet.names)} models ({len(fleet.values)} rows) in {built * 1e3:.1f} ms, "
+          f"ranked in {ranked * 1e3:.1f} ms.")
@@ -0,0 +1,127 @@
+import os
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+class FootingCriteria:
+    # Design space and checks for a square pad footing with optional ballast blocks.
+    # Forces in kN, moments in kNm, lengths in m, pressures in kPa.
+    def __init__(self, widths=None, depths=None, max_blocks=12, block_weight=58.9,
+                 concrete_density=25.0, allowable_bearing=200.0, friction=0.5,
+                 overturning_factor=1.5, sliding_factor=1.5, concrete_cost=150.0, block_cost=60.0):
+        self.widths = widths or [round(3.0 + 0.25 * i, 2) for i in range(41)]
+        self.depths = depths or [round(1.0 + 0.25 * i, 2) for i in range(9)]
+        self.max_blocks = max_blocks
+        self.block_weight = block_weight
+        self.concrete_density = concrete_density
+        self.allowable_bearing = allowable_bearing
+        self.friction = friction
+        self.overturning_factor = overturning_factor
+        self.sliding_factor = sliding_factor
+        self.concrete_cost = concrete_cost
+        self.block_cost = block_cost
+
+def check_footing(width, depth, blocks, cases, criteria):
+    # cases: [(moment, vertical, horizontal), ...] at the top of the footing.
+    # Returns None when every case passes, otherwise the name of the first failing check
+    footing_weight = width * width * depth * criteria.concrete_density + blocks * criteria.block_weight
+    for moment, vertical, horizontal in cases:
+        total_vertical = vertical + footing_weight
+        total_moment = moment + horizontal * depth
+        if total_vertical * width / 2 < criteria.overturning_factor * total_moment:
+            return "overturning"
+        if criteria.friction * total_vertical < criteria.sliding_factor * horizontal:
+            return "sliding"
+        eccentricity = total_moment / total_vertical
+        if eccentricity <= width / 6:
+            pressure = total_vertical / (width * width) * (1 + 6 * eccentricity / width)
+        else:
+            pressure = 2 * total_vertical / (3 * width * (width / 2 - eccentricity))
+        if pressure > criteria.allowable_bearing:
+            return "bearing"
+    return None
+
+def footing_cost(width, depth, blocks, criteria):
+    return width * width * depth * criteria.concrete_cost + blocks * criteria.block_cost
+
+def size_footing(cases, criteria=None):
+    # Cheapest passing (width, depth, blocks) for one set of load cases, or None.
+    # For a fixed depth and block count every check only gets easier as the footing
+    # widens, so the narrowest passing width is found by bisection and wider
+    # footings are never evaluated.
+    criteria = criteria or FootingCriteria()
+    widths = sorted(criteria.widths)
+    best = None
+    for depth in sorted(criteria.depths):
+        for blocks in range(criteria.max_blocks + 1):
+            # Cheapest conceivable footing for this depth/blocks already loses
+            if best and footing_cost(widths[0], depth, blocks, criteria) >= best["cost"]:
+                break
+            i = _first_passing(widths, depth, blocks, cases, criteria)
+            if i is None:
+                continue
+            width = widths[i]
+            cost = footing_cost(width, depth, blocks, criteria)
+            if best is None or cost < best["cost"]:
+                best = {"width": width, "depth": depth, "blocks": blocks, "cost": cost}
+    return best
+
+def _first_passing(widths, depth, blocks, cases, criteria):
+    low, high = 0, len(widths)
+    while low < high:
+        middle = (low + high) // 2
+        if check_footing(widths[middle], depth, blocks, cases, criteria) is None:
+            high = middle
+        else:
+            low = middle + 1
+    return low if low < len(widths) else None
+
+def _size_job(job):
+    key, cases, criteria = job
+    return key, size_footing(cases, criteria)
+
+def size_many(configurations, criteria=None, workers=None):
+    # configurations: {key: [(moment, vertical, horizontal), ...]}
+    # Returns {key: design or None}, sized across a process pool
+    criteria = criteria or FootingCriteria()
+    jobs = [(key, cases, criteria) for key, cases in configurations.items()]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return dict(map(_size_job, jobs))
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_size_job, jobs, chunksize=chunksize))
+
+def envelope_cases(model_name, mast_models=None, sections=range(1, 21), **kwargs):
+    # Load cases per (mast model, sections): every jib length's own in-service and
+    # out-of-service (moment, vertical, horizontal). Taking the maxima separately would
+    # pair the largest moment with the largest vertical force, and vertical load
+    # helps against overturning and sliding.
+    from envelope import foundation_reactions
+    grid = foundation_reactions(model_name, mast_models, sections, **kwargs)
+    states = [np.stack(getattr(grid, state), axis=-1) for state in ("in_service", "out_of_service")]
+    configurations = {}
+    for j, mast_model in enumerate(grid.mast_models):
+        for k, count in enumerate(grid.sections):
+            cases = [tuple(float(value) for value in values[i, j, k])
+                     for values in states for i in range(len(grid.jib_lengths))
+                     if not np.isnan(values[i, j, k]).any()]
+            configurations[(model_name, mast_model, int(count))] = list(dict.fromkeys(cases))
+    return configurations
+
+def size_cranes(model_names, mast_models=None, sections=range(1, 21), criteria=None, workers=None):
+    configurations = {}
+    for model_name in model_names:
+        configurations.update(envelope_cases(model_name, mast_models, sections))
+    return size_many(configurations, criteria, workers)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python foundation.py <crane model> [<crane model> ...]")
+        sys.exit(2)
+    for (model_name, mast_model, count), design in sorted(size_cranes(sys.argv[1:]).items()):
+        if design:
+            print(f"{model_name} / {mast_model} x {count}: {design['width']} x {design['width']} x "
+                  f"{design['depth']} m, {design['blocks']} blocks, cost {design['cost']:.0f}")
+        else:
+            print(f"{model_name} / {mast_model} x {count}: no passing footing in the design space")
@@ -1,9 +1,18 @@
+import time
+START_TIME = time.perf_counter()
+
 import sys
 import os
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QTextEdit, QMessageBox, QComboBox, QStackedWidget)
-from PyQt5.QtCore import Qt
-from main import CraneDatabase, MastDatabase
+                             QPushButton, QLabel, QLineEdit, QTextEdit, QMessageBox, QComboBox, QStackedWidget,
+                             QFileDialog, QProgressBar, QCheckBox, QCompleter)
+from PyQt5.QtCore import Qt, QStringListModel
+from main import (CRANE_FIELDS, MAST_FIELDS, MastDatabase, crane_db_path, cached_crane_data, cached_mast_data,
+                  create_crane_database, add_crane_data, delete_crane_database, add_mast_data)
+from tasks import TaskRunner
+
+# Cold start to the main menu should stay under this many seconds (checked with --startup-check)
+STARTUP_BUDGET = 1.0
 
 import sys
 import traceback
@@ -23,13 +32,14 @@ class MainWindow(QMainWindow):
         self.central_widget = QStackedWidget()
         self.setCentralWidget(self.central_widget)
 
-        self.main_menu = self.create_main_menu()
-        self.crane_window = CraneWindow(self)
-        self.mast_window = MastWindow(self)
+        # All database and calculation work runs here, off the GUI thread
+        self.tasks = TaskRunner()
 
+        self.main_menu = self.create_main_menu()
         self.central_widget.addWidget(self.main_menu)
-        self.central_widget.addWidget(self.crane_window)
-        self.central_widget.addWidget(self.mast_window)
+
+        # Sub-windows are built the first time they are opened
+        self.windows = {}
 
     def create_main_menu(self):
         widget = QWidget()
@@ -38,27 +48,78 @@ class MainWindow(QMainWindow):
 
         self.crane_btn = QPushButton("Manage Crane Data")
         self.mast_btn = QPushButton("Manage Mast Data")
+        self.components_btn = QPushButton("Manage Components")
+        self.tools_btn = QPushButton("Tools")
+        self.diagnostics_btn = QPushButton("Diagnostics")
         self.exit_btn = QPushButton("Exit")
 
         layout.addWidget(self.crane_btn)
         layout.addWidget(self.mast_btn)
+        layout.addWidget(self.components_btn)
+        layout.addWidget(self.tools_btn)
+        layout.addWidget(self.diagnostics_btn)
         layout.addWidget(self.exit_btn)
 
         self.crane_btn.clicked.connect(self.open_crane_window)
         self.mast_btn.clicked.connect(self.open_mast_window)
+        self.components_btn.clicked.connect(self.open_components_window)
+        self.tools_btn.clicked.connect(self.open_tools_window)
+        self.diagnostics_btn.clicked.connect(self.open_diagnostics_window)
         self.exit_btn.clicked.connect(self.close)
 
         return widget
 
+    def window(self, window_class):
+        if window_class not in self.windows:
+            window = window_class(self)
+            self.windows[window_class] = window
+            self.central_widget.addWidget(window)
+        return self.windows[window_class]
+
+    @property
+    def crane_window(self):
+        return self.window(CraneWindow)
+
+    @property
+    def mast_window(self):
+        return self.window(MastWindow)
+
+    @property
+    def components_window(self):
+        return self.window(ComponentWindow)
+
+    @property
+    def tools_window(self):
+        return self.window(ToolsWindow)
+
+    @property
+    def diagnostics_window(self):
+        return self.window(DiagnosticsWindow)
+
     def open_crane_window(self):
         self.central_widget.setCurrentWidget(self.crane_window)
 
     def open_mast_window(self):
         self.central_widget.setCurrentWidget(self.mast_window)
 
+    def open_components_window(self):
+        self.central_widget.setCurrentWidget(self.components_window)
+
+    def open_tools_window(self):
+        self.central_widget.setCurrentWidget(self.tools_window)
+
+    def open_diagnostics_window(self):
+        self.diagnostics_window.refresh()
+        self.central_widget.setCurrentWidget(self.diagnostics_window)
+
     def back_to_main(self):
         self.central_widget.setCurrentWidget(self.main_menu)
 
+    def closeEvent(self, event):
+        self.tasks.cancel_all()
+        self.tasks.wait()
+        super().closeEvent(event)
+
 class CraneWindow(QWidget):
     def __init__(self, main_window):
         super().__init__()
@@ -71,17 +132,22 @@ class CraneWindow(QWidget):
         self.model_input = QLineEdit()
         self.model_input.setPlaceholderText("Enter crane model name")
         self.layout.addWidget(self.model_input)
+        attach_completer(self.model_input, "crane_names")
 
         self.create_btn = QPushButton("Create New Database")
         self.add_btn = QPushButton("Add/Update Data")
         self.retrieve_btn = QPushButton("Retrieve Data")
         self.delete_btn = QPushButton("Delete Database")
+        self.import_btn = QPushButton("Import Load Chart")
+        self.browse_btn = QPushButton("Browse Jib Lengths")
         self.back_btn = QPushButton("Back to Main Menu")
 
         self.layout.addWidget(self.create_btn)
         self.layout.addWidget(self.add_btn)
         self.layout.addWidget(self.retrieve_btn)
         self.layout.addWidget(self.delete_btn)
+        self.layout.addWidget(self.import_btn)
+        self.layout.addWidget(self.browse_btn)
         self.layout.addWidget(self.back_btn)
 
         self.result_text = QTextEdit()
@@ -92,6 +158,8 @@ class CraneWindow(QWidget):
         self.add_btn.clicked.connect(self.add_data)
         self.retrieve_btn.clicked.connect(self.retrieve_data)
         self.delete_btn.clicked.connect(self.delete_database)
+        self.import_btn.clicked.connect(self.import_load_chart)
+        self.browse_btn.clicked.connect(self.browse_data)
         self.back_btn.clicked.connect(self.main_window.back_to_main)
 
         # Create stacked widget for different operations
@@ -101,6 +169,7 @@ class CraneWindow(QWidget):
         # Create and add widgets for different operations
         self.add_data_widget = CraneDataInputWidget(self)
         self.retrieve_data_widget = CraneRetrieveWidget(self)
+        self.browser_widget = None
 
         self.stacked_widget.addWidget(self.add_data_widget)
         self.stacked_widget.addWidget(self.retrieve_data_widget)
@@ -111,14 +180,28 @@ class CraneWindow(QWidget):
     def create_database(self):
         model_name = self.model_input.text()
         if model_name:
-            CraneDatabase(model_name)
-            self.result_text.setText(f"Database for {model_name} created successfully.")
+            self.result_text.setText(f"Creating database for {model_name}...")
+            self.main_window.tasks.submit(
+                create_crane_database, model_name,
+                on_result=lambda _: self.result_text.setText(f"Database for {model_name} created successfully."),
+                on_error=self.show_error)
         else:
             self.result_text.setText("Please enter a model name.")
 
+    def show_error(self, message):
+        self.result_text.setText(f"Database error: {message}")
+        self.show_main_buttons()
+
     def add_data(self):
         model_name = self.model_input.text()
-        if model_name:
+        if model_name and not os.path.exists(crane_db_path(model_name)):
+            # A typo would otherwise create a new, empty model database
+            from name_index import crane_names
+            suggestions = crane_names.suggest(model_name, 3)
+            hint = f" Did you mean {', '.join(suggestions)}?" if suggestions else ""
+            self.result_text.setText(f"Database for {model_name} not found.{hint} "
+                                     f"Use Create New Database for a new model.")
+        elif model_name:
             self.add_data_widget.set_model_name(model_name)
             self.stacked_widget.setCurrentWidget(self.add_data_widget)
             self.stacked_widget.show()
@@ -136,24 +219,60 @@ class CraneWindow(QWidget):
         else:
             self.result_text.setText("Please enter a model name.")
 
+    def browse_data(self):
+        model_name = self.model_input.text()
+        if not model_name:
+            self.result_text.setText("Please enter a model name.")
+        elif not os.path.exists(crane_db_path(model_name)):
+            self.result_text.setText(f"Database for {model_name} not found.")
+        else:
+            open_browser(self)
+            self.browser_widget.open_table(f"{model_name} jib lengths", crane_db_path(model_name),
+                                           "crane_data", CRANE_FIELDS, ["jib_length"])
+            self.stacked_widget.setCurrentWidget(self.browser_widget)
+            self.stacked_widget.show()
+            self.hide_main_buttons()
+
     def delete_database(self):
         model_name = self.model_input.text()
         if model_name:
-            db_name = f"CraneData/{model_name.lower().replace(' ', '_')}_crane.db"
-            if os.path.exists(db_name):
-                os.remove(db_name)
-                self.result_text.setText(f"Database for {model_name} deleted successfully.")
-            else:
-                self.result_text.setText(f"Database for {model_name} not found.")
+            def deleted(found):
+                if found:
+                    self.result_text.setText(f"Database for {model_name} deleted successfully.")
+                else:
+                    self.result_text.setText(f"Database for {model_name} not found.")
+            self.main_window.tasks.submit(delete_crane_database, model_name,
+                                          on_result=deleted, on_error=self.show_error)
         else:
             self.result_text.setText("Please enter a model name.")
 
+    def import_load_chart(self):
+        model_name = self.model_input.text()
+        if not model_name:
+            self.result_text.setText("Please enter a model name.")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Import Load Chart", "",
+                                              "Load charts (*.csv *.xlsx *.xlsm *.xls)")
+        if not path:
+            return
+        from load_chart import import_load_chart
+
+        def imported(result):
+            count, seconds = result
+            self.result_text.setText(f"Imported {count} rows into {model_name} in {seconds:.3f} s "
+                                     f"({count / max(seconds, 1e-9):.0f} rows/s).")
+        self.result_text.setText(f"Importing {path}...")
+        self.main_window.tasks.submit(import_load_chart, model_name, path, on_result=imported,
+                                      on_error=lambda message: self.result_text.setText(f"Import failed: {message}"))
+
     def hide_main_buttons(self):
         self.model_input.hide()
         self.create_btn.hide()
         self.add_btn.hide()
         self.retrieve_btn.hide()
         self.delete_btn.hide()
+        self.import_btn.hide()
+        self.browse_btn.hide()
         self.back_btn.hide()
         self.result_text.hide()
 
@@ -163,6 +282,8 @@ class CraneWindow(QWidget):
         self.add_btn.show()
         self.retrieve_btn.show()
         self.delete_btn.show()
+        self.import_btn.show()
+        self.browse_btn.show()
         self.back_btn.show()
         self.result_text.show()
         self.stacked_widget.hide()
@@ -197,17 +318,25 @@ class CraneDataInputWidget(QWidget):
 
     def submit_data(self):
         try:
-            db = CraneDatabase(self.model_name)
             data = [float(self.inputs[field].text()) for field in self.inputs]
-            db.add_data(*data)
-            db.close()
-            self.parent.result_text.setText("Data added successfully.")
-            self.go_back()
-            # Clear the input fields after successful submission
-            for input_field in self.inputs.values():
-                input_field.clear()
         except ValueError:
             self.parent.result_text.setText("Please enter valid numeric values for all fields.")
+            return
+        self.submit_btn.setEnabled(False)
+        self.parent.main_window.tasks.submit(add_crane_data, self.model_name, data,
+                                             on_result=self.submitted, on_error=self.failed)
+
+    def submitted(self, _):
+        self.submit_btn.setEnabled(True)
+        self.parent.result_text.setText("Data added successfully.")
+        self.go_back()
+        # Clear the input fields after successful submission
+        for input_field in self.inputs.values():
+            input_field.clear()
+
+    def failed(self, message):
+        self.submit_btn.setEnabled(True)
+        self.parent.show_error(message)
 
     def go_back(self):
         self.parent.show_main_buttons()
@@ -233,24 +362,64 @@ class CraneRetrieveWidget(QWidget):
     def retrieve_data(self):
         try:
             jib_length = float(self.jib_length_input.text())
-            db = CraneDatabase(self.model_name)
-            data = db.get_data(jib_length)
-            db.close()
-
-            if data:
-                result = "\n".join([f"{field}: {value}" for field, value in zip(
-                    ["Jib length", "In-service moment", "In-service vertical force", "In-service horizontal force",
-                     "Out-of-service moment", "Out-of-service vertical force", "Out-of-service horizontal force",
-                     "Number of falls", "Tip load", "Max load radius", "Wind area", "Delta_h"],
-                    data
-                )])
-                self.parent.result_text.setText(result)
-            else:
-                self.parent.result_text.setText("No data found for the given jib length.")
-            self.parent.stacked_widget.hide()
-            self.parent.show_main_buttons()
         except ValueError:
             self.parent.result_text.setText("Please enter a valid numeric value for jib length.")
+            return
+        self.parent.main_window.tasks.submit(lookup_jib_length, self.model_name, jib_length,
+                                             on_result=self.show_result, on_error=self.parent.show_error)
+
+    def show_result(self, result):
+        data, note = result
+        if data:
+            result = "\n".join([f"{field}: {value}" for field, value in zip(
+                ["Jib length", "In-service moment", "In-service vertical force", "In-service horizontal force",
+                 "Out-of-service moment", "Out-of-service vertical force", "Out-of-service horizontal force",
+                 "Number of falls", "Tip load", "Max load radius", "Wind area", "Delta_h"],
+                data
+            )])
+            self.parent.result_text.setText(note + result)
+        else:
+            self.parent.result_text.setText("No data found for the given jib length.")
+        self.parent.stacked_widget.hide()
+        self.parent.show_main_buttons()
+
+def attach_completer(line_edit, source):
+    # Suggestions from name_index.<source> (prefix matches, then near misses) as the user types
+    model = QStringListModel(line_edit)
+    completer = QCompleter(model, line_edit)
+    completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+    line_edit.setCompleter(completer)
+
+    def update(text):
+        import name_index
+        suggestions = getattr(name_index, source).suggest(text.strip())
+        model.setStringList(suggestions)
+        if suggestions:
+            completer.complete()
+        else:
+            completer.popup().hide()
+    line_edit.textEdited.connect(update)
+    return completer
+
+def open_browser(window):
+    # The table browser is built on first use
+    if window.browser_widget is None:
+        from table_browser import TableBrowser
+        window.browser_widget = TableBrowser(window)
+        window.stacked_widget.addWidget(window.browser_widget)
+
+def lookup_jib_length(model_name, jib_length):
+    # Returns (row, note); falls back to interpolating between stored jib lengths
+    data = cached_crane_data(model_name, jib_length)
+    if data:
+        return data, ""
+    from jib_index import crane_jib_index
+    index = crane_jib_index(model_name)
+    data = index.interpolate(jib_length)
+    if not data:
+        return None, ""
+    below, above = index.bracket(jib_length)
+    return data, f"Interpolated between jib lengths {below[0]} and {above[0]}\n"
 
 class MastWindow(QWidget):
     def __init__(self, main_window):
@@ -263,10 +432,12 @@ class MastWindow(QWidget):
 
         self.add_btn = QPushButton("Add/Update Mast Data")
         self.retrieve_btn = QPushButton("Retrieve Mast Data")
+        self.browse_btn = QPushButton("Browse Masts")
         self.back_btn = QPushButton("Back to Main Menu")
 
         layout.addWidget(self.add_btn)
         layout.addWidget(self.retrieve_btn)
+        layout.addWidget(self.browse_btn)
         layout.addWidget(self.back_btn)
 
         self.result_text = QTextEdit()
@@ -275,6 +446,7 @@ class MastWindow(QWidget):
 
         self.add_btn.clicked.connect(self.add_data)
         self.retrieve_btn.clicked.connect(self.retrieve_data)
+        self.browse_btn.clicked.connect(self.browse_data)
         self.back_btn.clicked.connect(self.main_window.back_to_main)
 
         # Create stacked widget for different operations
@@ -284,6 +456,7 @@ class MastWindow(QWidget):
         # Create and add widgets for different operations
         self.add_data_widget = MastDataInputWidget(self)
         self.retrieve_data_widget = MastRetrieveWidget(self)
+        self.browser_widget = None
 
         self.stacked_widget.addWidget(self.add_data_widget)
         self.stacked_widget.addWidget(self.retrieve_data_widget)
@@ -291,6 +464,10 @@ class MastWindow(QWidget):
         # Initially hide the stacked widget
         self.stacked_widget.hide()
 
+    def show_error(self, message):
+        self.result_text.setText(f"Database error: {message}")
+        self.show_main_buttons()
+
     def add_data(self):
         self.stacked_widget.setCurrentWidget(self.add_data_widget)
         self.stacked_widget.show()
@@ -301,15 +478,27 @@ class MastWindow(QWidget):
         self.stacked_widget.show()
         self.hide_main_buttons()
 
+    def browse_data(self):
+        if not os.path.exists(MastDatabase.db_name):
+            self.result_text.setText("No mast data has been added yet.")
+            return
+        open_browser(self)
+        self.browser_widget.open_table("Masts", MastDatabase.db_name, "mast_data", MAST_FIELDS, ["mast_model"])
+        self.stacked_widget.setCurrentWidget(self.browser_widget)
+        self.stacked_widget.show()
+        self.hide_main_buttons()
+
     def hide_main_buttons(self):
         self.add_btn.hide()
         self.retrieve_btn.hide()
+        self.browse_btn.hide()
         self.back_btn.hide()
         self.result_text.hide()
 
     def show_main_buttons(self):
         self.add_btn.show()
         self.retrieve_btn.show()
+        self.browse_btn.show()
         self.back_btn.show()
         self.result_text.show()
         self.stacked_widget.hide()
@@ -339,18 +528,26 @@ class MastDataInputWidget(QWidget):
 
     def submit_data(self):
         try:
-            db = MastDatabase()
             mast_model = self.inputs["mast_model"].text()
             data = [float(self.inputs[field].text()) for field in ["self_weight", "mast_height", "mast_wind_area"]]
-            db.add_data(mast_model, *data)
-            db.close()
-            self.parent.result_text.setText("Mast data added/updated successfully.")
-            self.go_back()
-            # Clear the input fields after successful submission
-            for input_field in self.inputs.values():
-                input_field.clear()
         except ValueError:
             self.parent.result_text.setText("Please enter valid numeric values for all fields except mast model.")
+            return
+        self.submit_btn.setEnabled(False)
+        self.parent.main_window.tasks.submit(add_mast_data, mast_model, *data,
+                                             on_result=self.submitted, on_error=self.failed)
+
+    def submitted(self, _):
+        self.submit_btn.setEnabled(True)
+        self.parent.result_text.setText("Mast data added/updated successfully.")
+        self.go_back()
+        # Clear the input fields after successful submission
+        for input_field in self.inputs.values():
+            input_field.clear()
+
+    def failed(self, message):
+        self.submit_btn.setEnabled(True)
+        self.parent.show_error(message)
 
     def go_back(self):
         self.parent.show_main_buttons()
@@ -365,6 +562,7 @@ class MastRetrieveWidget(QWidget):
         self.mast_model_input = QLineEdit()
         self.mast_model_input.setPlaceholderText("Enter mast model")
         layout.addWidget(self.mast_model_input)
+        attach_completer(self.mast_model_input, "mast_names")
 
         self.retrieve_btn = QPushButton("Retrieve")
         layout.addWidget(self.retrieve_btn)
@@ -372,10 +570,10 @@ class MastRetrieveWidget(QWidget):
 
     def retrieve_data(self):
         mast_model = self.mast_model_input.text()
-        db = MastDatabase()
-        data = db.get_data(mast_model)
-        db.close()
+        self.parent.main_window.tasks.submit(cached_mast_data, mast_model,
+                                             on_result=self.show_result, on_error=self.parent.show_error)
 
+    def show_result(self, data):
         if data:
             result = "\n".join([f"{field}: {value}" for field, value in zip(
                 ["Mast model", "Self weight", "Mast height", "Mast wind area"],
@@ -387,8 +585,266 @@ class MastRetrieveWidget(QWidget):
         self.parent.stacked_widget.hide()
         self.parent.show_main_buttons()
 
+class ComponentWindow(QWidget):
+    # One form for every registered component type, generated from its field list
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Component Database Manager")
+        from components import COMPONENT_TYPES
+        self.component_types = COMPONENT_TYPES
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.type_input = QComboBox()
+        for component_type in COMPONENT_TYPES.values():
+            self.type_input.addItem(component_type.title, component_type.name)
+        layout.addWidget(self.type_input)
+
+        self.form_layout = QVBoxLayout()
+        layout.addLayout(self.form_layout)
+        self.inputs = {}
+
+        buttons = QHBoxLayout()
+        self.save_btn = QPushButton("Add/Update")
+        self.retrieve_btn = QPushButton("Retrieve")
+        self.delete_btn = QPushButton("Delete")
+        buttons.addWidget(self.save_btn)
+        buttons.addWidget(self.retrieve_btn)
+        buttons.addWidget(self.delete_btn)
+        layout.addLayout(buttons)
+
+        self.back_btn = QPushButton("Back to Main Menu")
+        layout.addWidget(self.back_btn)
+
+        self.result_text = QTextEdit()
+        self.result_text.setReadOnly(True)
+        layout.addWidget(self.result_text)
+
+        self.type_input.currentIndexChanged.connect(self.build_form)
+        self.save_btn.clicked.connect(self.save_data)
+        self.retrieve_btn.clicked.connect(self.retrieve_data)
+        self.delete_btn.clicked.connect(self.delete_data)
+        self.back_btn.clicked.connect(self.main_window.back_to_main)
+        self.build_form()
+
+    def component_type(self):
+        return self.component_types[self.type_input.currentData()]
+
+    def build_form(self):
+        for input_field in self.inputs.values():
+            self.form_layout.removeWidget(input_field)
+            input_field.deleteLater()
+        self.inputs = {}
+        for field, unit in self.component_type().fields:
+            label = field.replace("_", " ").title()
+            self.inputs[field] = QLineEdit()
+            self.inputs[field].setPlaceholderText(f"{label} ({unit})" if unit else label)
+            self.form_layout.addWidget(self.inputs[field])
+
+    def save_data(self):
+        component_type = self.component_type()
+        try:
+            record = component_type.validate([self.inputs[field].text() for field in component_type.columns])
+        except ValueError as e:
+            self.result_text.setText(str(e))
+            return
+        from components import ComponentDatabase
+
+        def save():
+            db = ComponentDatabase()
+            try:
+                db.add_data(component_type.name, record)
+            finally:
+                db.close()
+        self.main_window.tasks.submit(
+            save, on_result=lambda _: self.result_text.setText(f"{component_type.title} {record[0]} saved."),
+            on_error=self.show_error)
+
+    def retrieve_data(self):
+        component_type = self.component_type()
+        key = self.inputs[component_type.key].text().strip()
+        if not key:
+            self.result_text.setText(f"Please enter a {component_type.key.replace('_', ' ')}.")
+            return
+        from components import cached_component_data
+
+        def show(data):
+            if data:
+                self.result_text.setText("\n".join(
+                    f"{field.replace('_', ' ').capitalize()}: {value} {unit}".rstrip()
+                    for (field, unit), value in zip(component_type.fields, data)))
+            else:
+                self.result_text.setText(f"No {component_type.title.lower()} found for {key}.")
+        self.main_window.tasks.submit(cached_component_data, component_type.name, key,
+                                      on_result=show, on_error=self.show_error)
+
+    def delete_data(self):
+        component_type = self.component_type()
+        key = self.inputs[component_type.key].text().strip()
+        if not key:
+            self.result_text.setText(f"Please enter a {component_type.key.replace('_', ' ')}.")
+            return
+        from components import ComponentDatabase
+
+        def delete():
+            db = ComponentDatabase()
+            try:
+                return db.delete_data(component_type.name, key)
+            finally:
+                db.close()
+
+        def deleted(found):
+            self.result_text.setText(f"{key} deleted." if found else f"{key} not found.")
+        self.main_window.tasks.submit(delete, on_result=deleted, on_error=self.show_error)
+
+    def show_error(self, message):
+        self.result_text.setText(f"Database error: {message}")
+
+class ToolsWindow(QWidget):
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Tools")
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        layout.addWidget(QLabel("Export all crane and mast databases"))
+        self.format_input = QComboBox()
+        self.format_input.addItems(["csv", "xlsx", "parquet"])
+        layout.addWidget(self.format_input)
+
+        self.export_btn = QPushButton("Export...")
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.back_btn = QPushButton("Back to Main Menu")
+        layout.addWidget(self.export_btn)
+        layout.addWidget(self.cancel_btn)
+
+        self.progress = QProgressBar()
+        layout.addWidget(self.progress)
+        layout.addWidget(self.back_btn)
+
+        self.result_text = QTextEdit()
+        self.result_text.setReadOnly(True)
+        layout.addWidget(self.result_text)
+
+        self.task = None
+        self.export_btn.clicked.connect(self.export_data)
+        self.cancel_btn.clicked.connect(self.cancel_export)
+        self.back_btn.clicked.connect(self.main_window.back_to_main)
+
+    def export_data(self):
+        output_dir = QFileDialog.getExistingDirectory(self, "Export to folder")
+        if not output_dir:
+            return
+        from export import export_all
+        fmt = self.format_input.currentText()
+        self.export_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress.setValue(0)
+        self.result_text.setText(f"Exporting to {output_dir}...")
+        self.task = self.main_window.tasks.submit(
+            lambda task: export_all(output_dir, fmt, progress=task.report_progress), with_task=True,
+            on_result=self.exported, on_error=self.failed, on_progress=self.show_progress)
+        self.task.signals.finished.connect(self.export_finished)
+
+    def show_progress(self, done, total):
+        self.progress.setMaximum(total)
+        self.progress.setValue(done)
+
+    def exported(self, result):
+        count, seconds, errors = result
+        lines = [f"Failed: {out_path}: {error}" for out_path, error in errors.items()]
+        lines.append(f"Exported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
+        self.result_text.setText("\n".join(lines))
+
+    def failed(self, message):
+        self.result_text.setText(f"Export failed: {message}")
+
+    def cancel_export(self):
+        if self.task:
+            self.task.cancel()
+            self.result_text.setText("Export cancelled.")
+
+    def export_finished(self):
+        self.task = None
+        self.export_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+class DiagnosticsWindow(QWidget):
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWindowTitle("Diagnostics")
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.enable_input = QCheckBox("Record database timings")
+        layout.addWidget(self.enable_input)
+
+        buttons = QHBoxLayout()
+        self.refresh_btn = QPushButton("Refresh")
+        self.reset_btn = QPushButton("Reset")
+        self.save_btn = QPushButton("Save...")
+        buttons.addWidget(self.refresh_btn)
+        buttons.addWidget(self.reset_btn)
+        buttons.addWidget(self.save_btn)
+        layout.addLayout(buttons)
+
+        self.result_text = QTextEdit()
+        self.result_text.setReadOnly(True)
+        self.result_text.setLineWrapMode(QTextEdit.NoWrap)
+        layout.addWidget(self.result_text)
+
+        self.back_btn = QPushButton("Back to Main Menu")
+        layout.addWidget(self.back_btn)
+
+        self.enable_input.toggled.connect(self.set_enabled)
+        self.refresh_btn.clicked.connect(self.refresh)
+        self.reset_btn.clicked.connect(self.reset)
+        self.save_btn.clicked.connect(self.save)
+        self.back_btn.clicked.connect(self.main_window.back_to_main)
+
+    def set_enabled(self, checked):
+        import diagnostics
+        if checked:
+            diagnostics.enable()
+        else:
+            diagnostics.disable()
+        self.refresh()
+
+    def refresh(self):
+        import diagnostics
+        state = "on" if diagnostics.enabled() else "off"
+        self.result_text.setText(f"Recording is {state}.\n\n{diagnostics.report()}")
+
+    def reset(self):
+        import diagnostics
+        diagnostics.stats.reset()
+        self.refresh()
+
+    def save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save diagnostics", "diagnostics.json", "JSON (*.json)")
+        if path:
+            import diagnostics
+            diagnostics.dump(path)
+            self.result_text.append(f"\nSaved to {path}")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    if "--startup-check" in sys.argv:
+        # Time from loading this module to a running main menu, then exit
+        from PyQt5.QtCore import QTimer
+
+        def report_startup():
+            seconds = time.perf_counter() - START_TIME
+            print(f"startup {seconds:.3f} s (budget {STARTUP_BUDGET:.1f} s)")
+            app.exit(0 if seconds <= STARTUP_BUDGET else 1)
+        QTimer.singleShot(0, report_startup)
+    sys.exit(app.exec_())
@@ -0,0 +1,106 @@
+import os
+from array import array
+from bisect import bisect_left
+from main import CRANE_FIELDS, crane_db_path, read_table, table_cache
+
+class JibIndex:
+    # Sorted jib lengths of one crane model with the matching crane_data rows
+    def __init__(self, rows):
+        rows = sorted(rows, key=lambda row: row[0])
+        self.rows = [tuple(row) for row in rows]
+        self.jib_lengths = array('d', (row[0] for row in rows))
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, jib_length):
+        i = bisect_left(self.jib_lengths, jib_length)
+        if i < len(self.rows) and self.jib_lengths[i] == jib_length:
+            return self.rows[i]
+        return None
+
+    def nearest(self, jib_length):
+        if not self.rows:
+            return None
+        i = bisect_left(self.jib_lengths, jib_length)
+        if i == 0:
+            return self.rows[0]
+        if i == len(self.rows):
+            return self.rows[-1]
+        below, above = self.jib_lengths[i - 1], self.jib_lengths[i]
+        # Ties go to the longer jib, which carries the larger reactions
+        return self.rows[i - 1] if jib_length - below < above - jib_length else self.rows[i]
+
+    def bracket(self, jib_length):
+        # (row below, row above); both are the same row on an exact match and
+        # one side is None outside the stored range
+        i = bisect_left(self.jib_lengths, jib_length)
+        if i < len(self.rows) and self.jib_lengths[i] == jib_length:
+            return self.rows[i], self.rows[i]
+        below = self.rows[i - 1] if i > 0 else None
+        above = self.rows[i] if i < len(self.rows) else None
+        return below, above
+
+    def interpolate(self, jib_length):
+        # Linear interpolation of every column between the bracketing jib lengths;
+        # None outside the stored range (no extrapolation)
+        below, above = self.bracket(jib_length)
+        if below is None or above is None:
+            return None
+        if below is above:
+            return below
+        t = (jib_length - below[0]) / (above[0] - below[0])
+        return (float(jib_length),) + tuple(
+            a + (b - a) * t if a is not None and b is not None else None
+            for a, b in zip(below[1:], above[1:]))
+
+    def as_arrays(self):
+        import numpy as np
+        if self._arrays is None:
+            values = np.array([[np.nan if v is None else v for v in row] for row in self.rows], dtype=float)
+            self._arrays = (values[:, 0].copy() if len(values) else np.empty(0),
+                            values.reshape(len(self.rows), len(CRANE_FIELDS)))
+        return self._arrays
+
+    def nearest_many(self, jib_lengths):
+        # Returns an (n, 12) array of the nearest stored rows
+        import numpy as np
+        keys, values = self.as_arrays()
+        query = np.asarray(jib_lengths, dtype=float)
+        if not len(keys):
+            return np.full(query.shape + (len(CRANE_FIELDS),), np.nan)
+        i = np.clip(np.searchsorted(keys, query), 1, max(len(keys) - 1, 1))
+        lower = np.maximum(i - 1, 0)
+        upper = np.minimum(i, len(keys) - 1)
+        pick = np.where(query - keys[lower] < keys[upper] - query, lower, upper)
+        return values[pick]
+
+    def interpolate_many(self, jib_lengths):
+        # Returns an (n, 12) array; rows outside the stored range are NaN
+        import numpy as np
+        keys, values = self.as_arrays()
+        query = np.asarray(jib_lengths, dtype=float)
+        result = np.full(query.shape + (len(CRANE_FIELDS),), np.nan)
+        if not len(keys):
+            return result
+        inside = (query >= keys[0]) & (query <= keys[-1])
+        q = query[inside]
+        upper = np.clip(np.searchsorted(keys, q), 1, max(len(keys) - 1, 1))
+        if len(keys) == 1:
+            result[inside] = values[0]
+        else:
+            lower = upper - 1
+            span = keys[upper] - keys[lower]
+            t = ((q - keys[lower]) / span)[:, None]
+            result[inside] = values[lower] + (values[upper] - values[lower]) * t
+        result[inside, 0] = q
+        return result
+
+def crane_jib_index(model_name):
+    # Cached per model, rebuilt when the model's database changes
+    db_name = crane_db_path(model_name)
+    if not os.path.exists(db_name):
+        return JibIndex([])
+    return table_cache.get_table(
+        db_name, lambda: JibIndex(read_table(db_name, 'SELECT * FROM crane_data').values()), kind="jib_index")
@@ -0,0 +1,78 @@
+import csv
+import os
+import sqlite3
+import sys
+import time
+from main import CraneDatabase, CRANE_FIELDS
+
+def normalize_header(name):
+    return str(name).strip().lower().replace(' ', '_').replace('-', '_')
+
+def order_rows(header, rows):
+    # Reorder columns by header name so charts may list the fields in any order
+    names = [normalize_header(name) for name in header]
+    missing = [field for field in CRANE_FIELDS if field not in names]
+    if missing:
+        raise ValueError(f"Load chart is missing columns: {', '.join(missing)}")
+    positions = [names.index(field) for field in CRANE_FIELDS]
+    for row in rows:
+        if not any(str(value).strip() for value in row if value is not None):
+            continue
+        yield [row[i] if i < len(row) else None for i in positions]
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return []
+        try:
+            [float(value) for value in first]
+        except ValueError:
+            return list(order_rows(first, reader))
+        # No header row, columns are taken in CRANE_FIELDS order
+        return [first] + [row for row in reader if row]
+
+def read_excel(path):
+    import pandas as pd
+    frame = pd.read_excel(path, header=0)
+    return list(order_rows(frame.columns, frame.itertuples(index=False, name=None)))
+
+def read_load_chart(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return read_csv(path)
+    if extension in ('.xlsx', '.xlsm', '.xls'):
+        return read_excel(path)
+    raise ValueError(f"Unsupported load chart format: {extension or path}")
+
+def import_rows(model_name, rows):
+    # Returns (row count, seconds taken)
+    start = time.perf_counter()
+    db = CraneDatabase(model_name)
+    try:
+        count = db.add_many(rows)
+    finally:
+        db.close()
+    return count, time.perf_counter() - start
+
+def import_load_chart(model_name, path):
+    start = time.perf_counter()
+    rows = read_load_chart(path)
+    count, _ = import_rows(model_name, rows)
+    return count, time.perf_counter() - start
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python load_chart.py <crane model> <load chart .csv/.xlsx>")
+        sys.exit(2)
+    try:
+        count, seconds = import_load_chart(sys.argv[1], sys.argv[2])
+    except (OSError, ValueError) as e:
+        print(f"Import failed: {e}")
+        sys.exit(1)
+    except sqlite3.Error as e:
+        # Usually a model file created with the old 11-column crane_data table
+        print(f"Import failed: {e}. Run python maintenance.py to repair the database schemas.")
+        sys.exit(1)
+    print(f"Imported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
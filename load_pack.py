@@ -0,0 +1,210 @@
+import glob
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+import numpy as np
+from main import CRANE_FIELDS, MAST_FIELDS, MastDatabase, connect, normalize_model_name
+
+# Read-only single-file copy of every crane_data and mast_data table.
+# Layout, little endian, every section 8-byte aligned:
+#   header      HEADER struct
+#   directory   one DIRECTORY record per model, sorted by name
+#   masts       one DIRECTORY record per mast model, sorted by name
+#   names       UTF-8 model and mast names the records point into
+#   data        per model, 12 float64 columns of `rows` values each, sorted by
+#               jib length; then the mast values as (masts, 3) float64 rows
+MAGIC = b"CRANEPK1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIIQQQQ")
+DIRECTORY = np.dtype([("data_offset", "<u8"), ("rows", "<u8"), ("name_offset", "<u4"), ("name_length", "<u4")])
+DEFAULT_PACK = "crane_data.pack"
+
+def _align(offset):
+    return (offset + 7) // 8 * 8
+
+def read_model_rows(path):
+    # Every row of one model database sorted by jib length, as a (rows, 12) array.
+    # A legacy 11-column crane_data table (not yet repaired by maintenance.py) has no
+    # number_of_falls column; it reads as NaN.
+    conn = connect(path, read_only=True)
+    try:
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(crane_data)')}
+        if not existing:
+            return np.empty((0, len(CRANE_FIELDS)))
+        columns = [field if field in existing else "NULL" for field in CRANE_FIELDS]
+        rows = conn.execute(f'SELECT {", ".join(columns)} FROM crane_data ORDER BY jib_length').fetchall()
+    finally:
+        conn.close()
+    return np.array(rows, dtype=float).reshape(len(rows), len(CRANE_FIELDS))
+
+def read_mast_rows(path=MastDatabase.db_name):
+    if not os.path.exists(path):
+        return []
+    conn = connect(path, read_only=True)
+    try:
+        return conn.execute(f'SELECT {", ".join(MAST_FIELDS)} FROM mast_data ORDER BY mast_model').fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+def build_pack(out_path=DEFAULT_PACK, directory="CraneData", mast_db=MastDatabase.db_name):
+    # Returns (models, rows, seconds)
+    start = time.perf_counter()
+    models = []
+    for path in sorted(glob.glob(os.path.join(directory, "*_crane.db"))):
+        models.append((os.path.basename(path)[:-len("_crane.db")], read_model_rows(path)))
+    masts = read_mast_rows(mast_db)
+
+    names = bytearray()
+    model_directory = np.zeros(len(models), dtype=DIRECTORY)
+    mast_directory = np.zeros(len(masts), dtype=DIRECTORY)
+    for records, entries in ((model_directory, [name for name, _ in models]),
+                             (mast_directory, [row[0] for row in masts])):
+        for i, name in enumerate(entries):
+            encoded = name.encode("utf-8")
+            records[i]["name_offset"] = len(names)
+            records[i]["name_length"] = len(encoded)
+            names += encoded
+
+    directory_offset = _align(HEADER.size)
+    masts_offset = directory_offset + model_directory.nbytes
+    names_offset = masts_offset + mast_directory.nbytes
+    data_offset = _align(names_offset + len(names))
+    offset = data_offset
+    for i, (_, rows) in enumerate(models):
+        model_directory[i]["data_offset"] = offset
+        model_directory[i]["rows"] = len(rows)
+        offset += rows.nbytes
+    mast_values = np.array([row[1:] for row in masts], dtype=float).reshape(len(masts), len(MAST_FIELDS) - 1)
+    for i in range(len(masts)):
+        mast_directory[i]["data_offset"] = offset + i * mast_values.itemsize * mast_values.shape[1]
+        mast_directory[i]["rows"] = 1
+
+    temporary = f"{out_path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(CRANE_FIELDS), len(models), len(masts),
+                            directory_offset, masts_offset, names_offset, data_offset))
+        f.write(b"\0" * (directory_offset - HEADER.size))
+        f.write(model_directory.tobytes())
+        f.write(mast_directory.tobytes())
+        f.write(bytes(names))
+        f.write(b"\0" * (data_offset - names_offset - len(names)))
+        for _, rows in models:
+            # Column-major, so each column is one contiguous run
+            f.write(np.ascontiguousarray(rows.T).tobytes())
+        f.write(mast_values.tobytes())
+    os.replace(temporary, out_path)
+    return len(models), sum(len(rows) for _, rows in models), time.perf_counter() - start
+
+class LoadPack:
+    # mmap'd reader. Tables are NumPy views straight into the mapping; nothing is
+    # parsed or copied until a lookup touches it. Drop views before close().
+    def __init__(self, path=DEFAULT_PACK):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, columns, model_count, mast_count,
+         directory_offset, masts_offset, names_offset, data_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION or columns != len(CRANE_FIELDS):
+            self.mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} load-table pack")
+        self.directory = np.frombuffer(self.mm, DIRECTORY, model_count, directory_offset)
+        self.mast_directory = np.frombuffer(self.mm, DIRECTORY, mast_count, masts_offset)
+        names = bytes(self.mm[names_offset:data_offset])
+        self.model_positions = {self._name(names, record): i for i, record in enumerate(self.directory)}
+        self.mast_names = [self._name(names, record) for record in self.mast_directory]
+        self.mast_positions = {name: i for i, name in enumerate(self.mast_names)}
+        self.views = {}
+        self.mast_values = np.frombuffer(self.mm, np.float64, mast_count * (len(MAST_FIELDS) - 1),
+                                         int(self.mast_directory[0]["data_offset"]) if mast_count else 0
+                                         ).reshape(mast_count, len(MAST_FIELDS) - 1)
+
+    @staticmethod
+    def _name(names, record):
+        start = int(record["name_offset"])
+        return names[start:start + int(record["name_length"])].decode("utf-8")
+
+    def models(self):
+        return list(self.model_positions)
+
+    def columns(self, model_name):
+        # (12, rows) view; columns[0] is the sorted jib-length index. None for unknown models
+        name = normalize_model_name(model_name)
+        view = self.views.get(name)
+        if view is None:
+            i = self.model_positions.get(name)
+            if i is None:
+                return None
+            record = self.directory[i]
+            rows = int(record["rows"])
+            view = np.frombuffer(self.mm, np.float64, rows * len(CRANE_FIELDS),
+                                 int(record["data_offset"])).reshape(len(CRANE_FIELDS), rows)
+            self.views[name] = view
+        return view
+
+    def as_arrays(self, model_name):
+        # Same shape as JibIndex.as_arrays: (jib lengths, (rows, 12) values)
+        columns = self.columns(model_name)
+        if columns is None:
+            return np.empty(0), np.empty((0, len(CRANE_FIELDS)))
+        return columns[0], columns.T
+
+    def get_data(self, model_name, jib_length):
+        # Same row as CraneDatabase(model_name).get_data(jib_length), or None
+        columns = self.columns(model_name)
+        if columns is None:
+            return None
+        jib_lengths = columns[0]
+        i = int(np.searchsorted(jib_lengths, jib_length))
+        if i == len(jib_lengths) or jib_lengths[i] != jib_length:
+            return None
+        return tuple(None if value != value else value for value in columns[:, i].tolist())
+
+    def mast_data(self, mast_model):
+        # Same row as MastDatabase().get_data(mast_model), or None
+        i = self.mast_positions.get(mast_model)
+        if i is None:
+            return None
+        return (mast_model,) + tuple(float(value) for value in self.mast_values[i])
+
+    def mast_table(self):
+        return {name: self.mast_data(name) for name in self.mast_names}
+
+    def reactions(self, model_name, mast_models=None, sections=range(1, 21), **kwargs):
+        # foundation_reactions over every stored jib length, read from the pack only
+        from envelope import ReactionGrid, compute_reactions
+        keys, crane_values = self.as_arrays(model_name)
+        mast_models = list(self.mast_names if mast_models is None else mast_models)
+        missing = [name for name in mast_models if name not in self.mast_positions]
+        if missing:
+            raise ValueError(f"Unknown mast models: {', '.join(missing)}")
+        mast_values = self.mast_values[[self.mast_positions[name] for name in mast_models]]
+        sections = np.asarray(list(sections), dtype=int)
+        in_service, out_of_service = compute_reactions(crane_values, mast_values, sections, **kwargs)
+        return ReactionGrid(keys, mast_models, sections, in_service, out_of_service)
+
+    def close(self):
+        self.directory = self.mast_directory = self.mast_values = None
+        self.views.clear()
+        self.mm.close()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("build", "get"):
+        print(f"Usage: python load_pack.py build [<output file>]   (default {DEFAULT_PACK})")
+        print("       python load_pack.py get <pack file> <crane model> <jib length>")
+        sys.exit(2)
+    if sys.argv[1] == "build":
+        out_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PACK
+        count, rows, seconds = build_pack(out_path)
+        print(f"Packed {count} models ({rows} rows) into {out_path} in {seconds:.3f} s "
+              f"({os.path.getsize(out_path)} bytes).")
+    else:
+        start = time.perf_counter()
+        pack = LoadPack(sys.argv[2])
+        opened = time.perf_counter() - start
+        print(pack.get_data(sys.argv[3], float(sys.argv[4])))
+        print(f"Opened {len(pack.models())} models in {opened * 1e3:.2f} ms.")
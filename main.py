@@ -1,12 +1,147 @@
 import sqlite3
 import os
+import math
+from cache import TableCache
+
+CRANE_FIELDS = ["jib_length", "in_service_moment", "in_service_vertical_force", "in_service_horizontal_force",
+                "out_of_service_moment", "out_of_service_vertical_force", "out_of_service_horizontal_force",
+                "number_of_falls", "tip_load", "max_load_radius", "wind_area", "delta_h"]
+
+MAST_FIELDS = ["mast_model", "self_weight", "mast_height", "mast_wind_area"]
+
+def normalize_model_name(model_name):
+    return model_name.lower().replace(' ', '_')
+
+def crane_db_path(model_name):
+    return f"CraneData/{normalize_model_name(model_name)}_crane.db"
+
+def list_crane_models():
+    # Normalized names of every model with a database in CraneData/
+    if not os.path.isdir('CraneData'):
+        return []
+    return sorted(name[:-len('_crane.db')] for name in os.listdir('CraneData') if name.endswith('_crane.db'))
+
+def validate_crane_row(row):
+    # Returns the row as a tuple of floats, or raises ValueError
+    values = tuple(row)
+    if len(values) != len(CRANE_FIELDS):
+        raise ValueError(f"expected {len(CRANE_FIELDS)} values, got {len(values)}")
+    result = []
+    for field, value in zip(CRANE_FIELDS, values):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} is not a number: {value!r}")
+        if not math.isfinite(number):
+            raise ValueError(f"{field} is not finite: {value!r}")
+        result.append(number)
+    if result[0] <= 0:
+        raise ValueError(f"jib_length must be positive: {result[0]}")
+    return tuple(result)
+
+def validate_mast_row(row):
+    values = tuple(row)
+    if len(values) != len(MAST_FIELDS):
+        raise ValueError(f"expected {len(MAST_FIELDS)} values, got {len(values)}")
+    try:
+        return (str(values[0]),) + tuple(float(value) for value in values[1:])
+    except (TypeError, ValueError):
+        raise ValueError("self weight, mast height and wind area must be numbers")
+
+def validate_rows(rows, validate):
+    # Validate every row first so a bad line never leaves a half-imported table;
+    # errors name the 1-based row
+    checked = []
+    for index, row in enumerate(rows, start=1):
+        try:
+            checked.append(validate(row))
+        except ValueError as e:
+            raise ValueError(f"Row {index}: {e}")
+    return checked
+
+table_cache = TableCache()
+
+# Set by diagnostics.enable() while recording; None keeps every call on the plain path
+profiler = None
+
+def profiled(operation, function, *args, **kwargs):
+    if profiler is None:
+        return function(*args, **kwargs)
+    return profiler.call(operation, function, *args, **kwargs)
+
+def connect(db_name, read_only=False, check_same_thread=True, **options):
+    # Every SQLite connection the program opens comes from here
+    if profiler is None:
+        return open_connection(db_name, read_only, check_same_thread, **options)
+    return profiler.connect(open_connection, db_name, read_only, check_same_thread, **options)
+
+def open_connection(db_name, read_only, check_same_thread, **options):
+    if read_only:
+        return sqlite3.connect(f"file:{db_name}?mode=ro", uri=True, check_same_thread=check_same_thread, **options)
+    conn = sqlite3.connect(db_name, check_same_thread=check_same_thread, **options)
+    # Files migrated to WAL by maintenance.py only need a sync at checkpoints
+    if conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+        conn.execute('PRAGMA synchronous = NORMAL')
+    return conn
+
+def create_changelog(cursor, table, key):
+    # Every insert, update and delete on table is logged by key in _changelog, so
+    # writes from any code path (add_data, the table browser, raw SQL) can be synced.
+    # origin is NULL for local edits and the peer site for changes applied by sync.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS _changelog (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        row_key,
+        origin TEXT,
+        origin_seq INTEGER
+    )
+    ''')
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_log_{event.lower()} AFTER {event} ON {table}
+        BEGIN INSERT INTO _changelog (row_key) VALUES ({row}.{key}); END
+        ''')
+    # Rows written before the log existed are logged once so a first sync sends them
+    cursor.execute(f"INSERT INTO _changelog (row_key) SELECT {key} FROM {table} "
+                   f"WHERE NOT EXISTS (SELECT 1 FROM _changelog)")
+
+def read_table(db_name, query):
+    return profiled("read_table (cache miss)", load_table, db_name, query)
+
+def load_table(db_name, query):
+    conn = connect(db_name, read_only=True)
+    try:
+        return {row[0]: row for row in conn.execute(query)}
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+def cached_crane_data(model_name, jib_length):
+    # Same result as CraneDatabase(model_name).get_data(jib_length) without
+    # opening a connection (or creating a file) on every lookup
+    db_name = crane_db_path(model_name)
+    if not os.path.exists(db_name):
+        return None
+    table = table_cache.get_table(db_name, lambda: read_table(db_name, 'SELECT * FROM crane_data'))
+    return table.get(float(jib_length))
+
+def cached_mast_table():
+    # {mast_model: row} for every stored mast
+    db_name = MastDatabase.db_name
+    if not os.path.exists(db_name):
+        return {}
+    return table_cache.get_table(db_name, lambda: read_table(db_name, 'SELECT * FROM mast_data'))
+
+def cached_mast_data(mast_model):
+    return cached_mast_table().get(mast_model)
 
 class CraneDatabase:
     def __init__(self, model_name):
         self.model_name = model_name
-        self.db_name = f"CraneData/{model_name.lower().replace(' ', '_')}_crane.db"
+        self.db_name = crane_db_path(model_name)
         os.makedirs('CraneData', exist_ok=True)
-        self.conn = sqlite3.connect(self.db_name)
+        self.conn = connect(self.db_name)
         self.cursor = self.conn.cursor()
         self.create_table()
 
@@ -19,7 +154,7 @@ class CraneDatabase:
             in_service_horizontal_force REAL,
             out_of_service_moment REAL,
             out_of_service_vertical_force REAL,
-            out_of_service_horizontal_force REAL
+            out_of_service_horizontal_force REAL,
             number_of_falls REAL,
             tip_load REAL,
             max_load_radius REAL,
@@ -27,6 +162,7 @@ class CraneDatabase:
             delta_h REAL
         )
         ''')
+        create_changelog(self.cursor, 'crane_data', 'jib_length')
         self.conn.commit()
 
     def add_data(self, jib_length, in_service_moment, in_service_vertical_force, in_service_horizontal_force,
@@ -38,6 +174,17 @@ class CraneDatabase:
               out_of_service_moment, out_of_service_vertical_force, out_of_service_horizontal_force,
               number_of_falls, tip_load, max_load_radius, wind_area, delta_h))
         self.conn.commit()
+        table_cache.invalidate(self.db_name)
+
+    def add_many(self, rows):
+        # All rows are validated, then written in one transaction
+        checked = validate_rows(rows, validate_crane_row)
+        with self.conn:
+            self.cursor.executemany('''
+            INSERT OR REPLACE INTO crane_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', checked)
+        table_cache.invalidate(self.db_name)
+        return len(checked)
 
     def get_data(self, jib_length):
         self.cursor.execute('SELECT * FROM crane_data WHERE jib_length = ?', (jib_length,))
@@ -47,10 +194,11 @@ class CraneDatabase:
         self.conn.close()
 
 class MastDatabase:
+    db_name = "MastData/mast_data.db"
+
     def __init__(self):
-        self.db_name = "MastData/mast_data.db"
         os.makedirs('MastData', exist_ok=True)
-        self.conn = sqlite3.connect(self.db_name)
+        self.conn = connect(self.db_name)
         self.cursor = self.conn.cursor()
         self.create_table()
 
@@ -63,6 +211,7 @@ class MastDatabase:
             mast_wind_area REAL
         )
         ''')
+        create_changelog(self.cursor, 'mast_data', 'mast_model')
         self.conn.commit()
 
     def add_data(self, mast_model, self_weight, mast_height, mast_wind_area):
@@ -70,6 +219,16 @@ class MastDatabase:
         INSERT OR REPLACE INTO mast_data VALUES (?, ?, ?, ?)
         ''', (mast_model, self_weight, mast_height, mast_wind_area))
         self.conn.commit()
+        table_cache.invalidate(self.db_name)
+
+    def add_many(self, rows):
+        checked = validate_rows(rows, validate_mast_row)
+        with self.conn:
+            self.cursor.executemany('''
+            INSERT OR REPLACE INTO mast_data VALUES (?, ?, ?, ?)
+            ''', checked)
+        table_cache.invalidate(self.db_name)
+        return len(checked)
 
     def get_data(self, mast_model):
         self.cursor.execute('SELECT * FROM mast_data WHERE mast_model = ?', (mast_model,))
@@ -78,6 +237,36 @@ class MastDatabase:
     def close(self):
         self.conn.close()
 
+def create_crane_database(model_name):
+    CraneDatabase(model_name).close()
+
+def add_crane_data(model_name, data):
+    db = CraneDatabase(model_name)
+    try:
+        db.add_data(*data)
+    finally:
+        db.close()
+
+def delete_crane_database(model_name):
+    # Returns False when there was no database for the model
+    db_name = crane_db_path(model_name)
+    if not os.path.exists(db_name):
+        return False
+    os.remove(db_name)
+    # WAL-mode databases leave these next to the file
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(db_name + suffix):
+            os.remove(db_name + suffix)
+    table_cache.invalidate(db_name)
+    return True
+
+def add_mast_data(mast_model, self_weight, mast_height, mast_wind_area):
+    db = MastDatabase()
+    try:
+        db.add_data(mast_model, self_weight, mast_height, mast_wind_area)
+    finally:
+        db.close()
+
 def db_operations():
     while True:
         print("\nCrane Database Management")
@@ -85,9 +274,10 @@ def db_operations():
         print("2. Add data to an existing crane model database")
         print("3. Retrieve data from a crane model database")
         print("4. Delete a crane model database")
-        print("5. Return to main menu")
+        print("5. Import a load chart (CSV/Excel) into a crane model database")
+        print("6. Return to main menu")
         
-        choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-6): ")
         
         if choice == '1':
             model_name = input("Enter the crane model name: ")
@@ -145,14 +335,25 @@ def db_operations():
         
         elif choice == '4':
             model_name = input("Enter the crane model name to delete: ")
-            db_name = f"CraneData/{model_name.lower().replace(' ', '_')}_crane.db"
-            if os.path.exists(db_name):
-                os.remove(db_name)
+            if delete_crane_database(model_name):
                 print(f"Database for {model_name} deleted successfully.")
             else:
                 print(f"Database for {model_name} not found.")
         
         elif choice == '5':
+            from load_chart import import_load_chart
+            model_name = input("Enter the crane model name: ")
+            path = input("Enter the load chart file (.csv, .xlsx): ")
+            try:
+                count, seconds = import_load_chart(model_name, path)
+                print(f"Imported {count} rows in {seconds:.3f} s ({count / max(seconds, 1e-9):.0f} rows/s).")
+            except (OSError, ValueError) as e:
+                print(f"Import failed: {e}")
+            except sqlite3.Error as e:
+                # Usually a model file created with the old 11-column crane_data table
+                print(f"Import failed: {e}. Run python maintenance.py to repair the database schemas.")
+        
+        elif choice == '6':
             print("Returning to main menu.")
             break
         
@@ -222,4 +423,8 @@ def main():
             print("Invalid choice. Please try again.")
 
 if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run(sys.argv[1:]))
     main()
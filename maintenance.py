@@ -0,0 +1,160 @@
+import glob
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from main import CRANE_FIELDS, MAST_FIELDS, MastDatabase, connect, create_changelog
+
+# Stored in PRAGMA user_version once a file has been checked or rebuilt
+SCHEMA_VERSION = 1
+
+# table: (key column, [(column, type), ...]) as CraneDatabase/MastDatabase create them
+SCHEMAS = {
+    "crane_data": ("jib_length", [(field, "REAL") for field in CRANE_FIELDS]),
+    "mast_data": ("mast_model", [("mast_model", "TEXT")] + [(field, "REAL") for field in MAST_FIELDS[1:]]),
+}
+
+def table_ddl(table, name=None):
+    key, columns = SCHEMAS[table]
+    definitions = [f"{column} {kind} PRIMARY KEY" if column == key else f"{column} {kind}"
+                   for column, kind in columns]
+    return f"CREATE TABLE {name or table} ({', '.join(definitions)})"
+
+def schema_drift(conn, table):
+    # Problems with the table's columns, [] when it matches SCHEMAS
+    key, columns = SCHEMAS[table]
+    found = [(row[1], " ".join(row[2].upper().split()), row[5])
+             for row in conn.execute(f"PRAGMA table_info({table})")]
+    if not found:
+        return ["table missing"]
+    expected = [(column, kind, 1 if column == key else 0) for column, kind in columns]
+    if found == expected:
+        return []
+    problems = []
+    names = {name: (kind, pk) for name, kind, pk in found}
+    for column, kind, pk in expected:
+        if column not in names:
+            problems.append(f"missing column {column}")
+        elif names[column] != (kind, pk):
+            problems.append(f"column {column} is {names[column][0] or 'untyped'}"
+                            + (" PRIMARY KEY" if names[column][1] else ""))
+    known = {column for column, _ in columns}
+    for name, _, _ in found:
+        if name not in known:
+            problems.append(f"unexpected column {name}")
+    if not problems:
+        problems.append("columns out of order")
+    return problems
+
+def rebuild_table(conn, table):
+    # Copies every row into a table with the current schema, matching columns by name
+    # (a missing column becomes NULL), and swaps it in within one transaction.
+    # The changelog triggers go with the old table and are recreated.
+    key, columns = SCHEMAS[table]
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    unexpected = sorted(existing - {column for column, _ in columns})
+    if unexpected:
+        raise ValueError(f"would drop columns {', '.join(unexpected)}; not rebuilt")
+    names = [column for column, _ in columns]
+    select = [column if column in existing else "NULL" for column in names]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {table}_rebuild")
+        conn.execute(table_ddl(table, f"{table}_rebuild"))
+        if existing:
+            conn.execute(f"INSERT OR REPLACE INTO {table}_rebuild ({', '.join(names)}) "
+                         f"SELECT {', '.join(select)} FROM {table}")
+            conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_rebuild RENAME TO {table}")
+        create_changelog(conn.cursor(), table, key)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def maintain_file(job):
+    # One database: check the schema, rebuild it if it drifted, switch to WAL.
+    # Returns a report dict; never raises, so one bad file does not stop the run.
+    path, table, check_only, wal = job
+    start = time.perf_counter()
+    report = {"path": path, "table": table, "status": "ok", "problems": [], "rows": 0}
+    conn = None
+    try:
+        conn = connect(path, isolation_level=None)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        integrity = conn.execute("PRAGMA quick_check").fetchone()[0]
+        if integrity != "ok":
+            raise ValueError(f"integrity check failed: {integrity}")
+        report["problems"] = schema_drift(conn, table)
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"schema version {version} is newer than this program ({SCHEMA_VERSION})")
+        if report["problems"]:
+            report["status"] = "drift"
+            if not check_only:
+                rebuild_table(conn, table)
+                report["status"] = "repaired"
+        elif version < SCHEMA_VERSION:
+            report["status"] = "unversioned"
+            if not check_only:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                report["status"] = "stamped"
+        if wal and not check_only:
+            report["journal_mode"] = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            conn.execute("PRAGMA optimize")
+        else:
+            report["journal_mode"] = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if table in {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}:
+            report["rows"] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    except (sqlite3.Error, ValueError) as e:
+        report["status"] = "error"
+        report["problems"].append(str(e))
+    finally:
+        if conn is not None:
+            conn.close()
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+def maintenance_jobs(directory="CraneData", check_only=False, wal=True):
+    jobs = [(path, "crane_data", check_only, wal)
+            for path in sorted(glob.glob(os.path.join(directory, "*_crane.db")))]
+    if os.path.exists(MastDatabase.db_name):
+        jobs.append((MastDatabase.db_name, "mast_data", check_only, wal))
+    return jobs
+
+def maintain_all(directory="CraneData", check_only=False, wal=True, workers=None):
+    # Returns (reports in file order, seconds)
+    start = time.perf_counter()
+    jobs = maintenance_jobs(directory, check_only, wal)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        reports = [maintain_file(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(maintain_file, jobs, chunksize=chunksize))
+    if not check_only:
+        from main import table_cache
+        table_cache.invalidate()
+    return reports, time.perf_counter() - start
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    unknown = [arg for arg in args if arg not in ("--check", "--no-wal")]
+    if unknown:
+        print("Usage: python maintenance.py [--check] [--no-wal]")
+        print("  --check   only report schema drift, change nothing")
+        print("  --no-wal  repair schemas but keep the current journal mode")
+        sys.exit(2)
+    reports, seconds = maintain_all(check_only="--check" in args, wal="--no-wal" not in args)
+    for report in reports:
+        detail = f" ({'; '.join(report['problems'])})" if report["problems"] else ""
+        print(f"{report['path']:48s} {report['status']:11s} {report.get('journal_mode', ''):4s} "
+              f"{report['rows']:7d} rows {report['seconds'] * 1e3:8.1f} ms{detail}")
+    counts = {}
+    for report in reports:
+        counts[report["status"]] = counts.get(report["status"], 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Checked {len(reports)} databases in {seconds:.3f} s: {summary or 'nothing to do'}.")
+    sys.exit(1 if counts.get("error") else 0)
@@ -0,0 +1,145 @@
+import os
+import threading
+from cache import file_signature
+from main import MastDatabase, cached_mast_table, list_crane_models, normalize_model_name
+
+# Fuzzy matches below this trigram similarity are not suggested
+MIN_SIMILARITY = 0.3
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    # Prefix trie plus a trigram inverted index over model names. Names are matched
+    # on their normalized form (lower case, spaces as underscores) and returned as stored.
+    def __init__(self, names=()):
+        self.root = {}
+        self.keys = {}
+        self.grams = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, name):
+        return name in self.keys
+
+    def add(self, name):
+        if name in self.keys:
+            return
+        key = normalize_model_name(name)
+        grams = trigrams(key)
+        self.keys[name] = (key, len(grams))
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        # The None slot of a node holds the names that end there
+        node.setdefault(None, set()).add(name)
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(name)
+
+    def remove(self, name):
+        entry = self.keys.pop(name, None)
+        if entry is None:
+            return
+        key = entry[0]
+        path = [self.root]
+        for char in key:
+            path.append(path[-1][char])
+        path[-1][None].discard(name)
+        if not path[-1][None]:
+            del path[-1][None]
+        # Prune nodes left without names below them
+        for depth in range(len(key), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][key[depth - 1]]
+        for gram in trigrams(key):
+            names = self.grams[gram]
+            names.discard(name)
+            if not names:
+                del self.grams[gram]
+
+    def complete(self, prefix, limit=10):
+        # Names starting with prefix, shortest keys first, then alphabetical
+        node = self.root
+        for char in normalize_model_name(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        results = []
+        level = [node]
+        while level and len(results) < limit:
+            below = []
+            for node in level:
+                results.extend(sorted(node.get(None, ())))
+                below.extend(node[char] for char in sorted(char for char in node if char is not None))
+            level = below
+        return results[:limit]
+
+    def fuzzy(self, query, limit=10):
+        # Names sharing the most trigrams with query (Dice similarity), best first
+        grams = trigrams(normalize_model_name(query))
+        shared = {}
+        for gram in grams:
+            for name in self.grams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        scored = []
+        for name, count in shared.items():
+            score = 2 * count / (len(grams) + self.keys[name][1])
+            if score >= MIN_SIMILARITY:
+                scored.append((-score, name))
+        scored.sort()
+        return [name for _, name in scored[:limit]]
+
+    def suggest(self, query, limit=10):
+        # Prefix completions first, then fuzzy matches for typos
+        if not query:
+            return []
+        results = self.complete(query, limit)
+        if len(results) < limit:
+            seen = set(results)
+            results.extend(name for name in self.fuzzy(query, limit) if name not in seen)
+        return results[:limit]
+
+class ModelNames:
+    # NameIndex kept in step with a source of names. Whenever the source's signature
+    # changes only the names that were created or deleted are added or removed.
+    def __init__(self, signature, load):
+        self.signature = signature
+        self.load = load
+        self.index = NameIndex()
+        self.current = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        signature = self.signature()
+        with self.lock:
+            if signature != self.current:
+                names = set(self.load())
+                for name in [name for name in self.index.keys if name not in names]:
+                    self.index.remove(name)
+                for name in names:
+                    self.index.add(name)
+                self.current = signature
+        return self.index
+
+    def suggest(self, query, limit=10):
+        index = self.refresh()
+        with self.lock:
+            return index.suggest(query, limit)
+
+    def __contains__(self, name):
+        return name in self.refresh()
+
+def _crane_directory_signature():
+    # Creating or deleting a model database changes the directory's mtime
+    try:
+        return os.stat('CraneData').st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+crane_names = ModelNames(_crane_directory_signature, list_crane_models)
+mast_names = ModelNames(lambda: file_signature(MastDatabase.db_name), lambda: cached_mast_table().keys())
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+from main import (CRANE_FIELDS, MAST_FIELDS, MastDatabase, connect, crane_db_path, list_crane_models,
+                  normalize_model_name, profiled, table_cache)
+
+HOST = "127.0.0.1"
+PORT = 8765
+# Idle pooled connections are closed after this many seconds, so the service never
+# keeps a model file open (and undeletable on Windows) for long
+IDLE_SECONDS = 5.0
+MAX_BODY = 1 << 20
+# The service is long-lived and answers for the whole fleet, so it keeps far more
+# tables than the GUI's default cache
+CACHE_TABLES = 4096
+
+class ConnectionPool:
+    # Read-only connections kept open per database file between cache misses
+    def __init__(self, max_idle=32):
+        self.max_idle = max_idle
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def read_table(self, path, query):
+        # Same result as main.read_table, on a reused connection
+        with self.lock:
+            pooled = self.idle.get(path)
+            conn = pooled.pop()[0] if pooled else None
+        if conn is None:
+            conn = connect(path, read_only=True, check_same_thread=False)
+        try:
+            table = {row[0]: row for row in conn.execute(query)}
+        except sqlite3.OperationalError:
+            conn.close()
+            return {}
+        with self.lock:
+            if sum(len(pooled) for pooled in self.idle.values()) < self.max_idle:
+                self.idle.setdefault(path, []).append((conn, time.monotonic()))
+                conn = None
+        if conn is not None:
+            conn.close()
+        return table
+
+    def close_idle(self, older_than=IDLE_SECONDS):
+        cutoff = time.monotonic() - older_than
+        closing = []
+        with self.lock:
+            for path, pooled in list(self.idle.items()):
+                closing.extend(conn for conn, used in pooled if used < cutoff)
+                pooled[:] = [(conn, used) for conn, used in pooled if used >= cutoff]
+                if not pooled:
+                    del self.idle[path]
+        for conn in closing:
+            conn.close()
+
+pool = ConnectionPool()
+
+def crane_table(model_name):
+    # Shares entries with main.cached_crane_data
+    db_name = crane_db_path(checked_model_name(model_name))
+    if not os.path.exists(db_name):
+        return None
+    return table_cache.get_table(db_name, lambda: profiled("read_table (cache miss)", pool.read_table,
+                                                           db_name, 'SELECT * FROM crane_data'))
+
+def mast_table():
+    db_name = MastDatabase.db_name
+    if not os.path.exists(db_name):
+        return {}
+    return table_cache.get_table(db_name, lambda: profiled("read_table (cache miss)", pool.read_table,
+                                                           db_name, 'SELECT * FROM mast_data'))
+
+def crane_record(row):
+    return dict(zip(CRANE_FIELDS, row)) if row else None
+
+def mast_record(row):
+    return dict(zip(MAST_FIELDS, row)) if row else None
+
+def crane_lookup(model_name, jib_lengths, interpolate=False):
+    # {"model", "found", "rows": [record or None per jib length]}
+    table = crane_table(model_name)
+    if table is None:
+        return {"model": normalize_model_name(model_name), "found": False, "rows": []}
+    rows = []
+    index = None
+    for jib_length in jib_lengths:
+        row = table.get(float(jib_length))
+        if row is None and interpolate:
+            if index is None:
+                from jib_index import crane_jib_index
+                index = crane_jib_index(model_name)
+            row = index.interpolate(float(jib_length))
+        rows.append(crane_record(row))
+    return {"model": normalize_model_name(model_name), "found": True, "rows": rows}
+
+def crane_rows(model_name):
+    table = crane_table(model_name)
+    if table is None:
+        return None
+    return [crane_record(table[key]) for key in sorted(table)]
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def checked_model_name(model_name):
+    # Names come from the URL (after %2F and friends are decoded) and from request
+    # bodies; one with a path in it would make crane_db_path leave CraneData/
+    if "/" in model_name or "\\" in model_name or ".." in model_name:
+        raise HttpError(400, f"Invalid model name: {model_name}")
+    return model_name
+
+def handle(method, path, query, body):
+    # Returns a JSON-serialisable result or raises HttpError.
+    #   GET  /cranes                           model names
+    #   GET  /cranes/<model>                   every row of one model
+    #   GET  /cranes/<model>?jib=30&jib=42.5   rows for those jib lengths (&interpolate=1)
+    #   POST /cranes/batch   {"queries": [{"model": ..., "jib_lengths": [...]}], "interpolate": false}
+    #   GET  /masts                            every mast
+    #   GET  /masts/<model>
+    #   POST /masts/batch    {"models": [...]}
+    #   GET  /stats
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+    if len(parts) == 2:
+        checked_model_name(parts[1])
+    if method == "GET" and parts == ["cranes"]:
+        return list_crane_models()
+    if method == "GET" and len(parts) == 2 and parts[0] == "cranes":
+        if "jib" in query:
+            try:
+                jib_lengths = [float(value) for value in query["jib"]]
+            except ValueError:
+                raise HttpError(400, "jib must be a number")
+            result = crane_lookup(parts[1], jib_lengths, query.get("interpolate", ["0"])[0] in ("1", "true"))
+            if not result["found"]:
+                raise HttpError(404, f"No database for crane model {parts[1]}")
+            return result
+        rows = crane_rows(parts[1])
+        if rows is None:
+            raise HttpError(404, f"No database for crane model {parts[1]}")
+        return rows
+    if method == "POST" and parts == ["cranes", "batch"]:
+        try:
+            return [crane_lookup(str(item["model"]), [float(value) for value in item["jib_lengths"]],
+                                 bool(body.get("interpolate")))
+                    for item in body["queries"]]
+        except (KeyError, TypeError, ValueError) as e:
+            raise HttpError(400, f"Expected {{\"queries\": [{{\"model\": ..., \"jib_lengths\": [...]}}]}}: {e}")
+    if method == "GET" and parts == ["masts"]:
+        return [mast_record(row) for _, row in sorted(mast_table().items())]
+    if method == "GET" and len(parts) == 2 and parts[0] == "masts":
+        record = mast_record(mast_table().get(parts[1]))
+        if record is None:
+            raise HttpError(404, f"No data for mast model {parts[1]}")
+        return record
+    if method == "POST" and parts == ["masts", "batch"]:
+        try:
+            table = mast_table()
+            return [mast_record(table.get(str(name))) for name in body["models"]]
+        except (KeyError, TypeError) as e:
+            raise HttpError(400, f"Expected {{\"models\": [...]}}: {e}")
+    if method == "GET" and parts == ["stats"]:
+        return {"requests": server_stats["requests"], "cache_hits": table_cache.hits,
+                "cache_misses": table_cache.misses, "cached_tables": len(table_cache.tables)}
+    raise HttpError(404, f"No route for {method} {path}")
+
+server_stats = {"requests": 0}
+
+async def read_request(reader):
+    # (method, target, headers, body) or None when the client closed the connection
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+def encode_response(status, payload, keep_alive):
+    reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 500: "Server Error"}
+    data = json.dumps(payload).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + data
+
+class Service:
+    # One asyncio server; lookups run on a small thread pool so a cache miss that
+    # reads a database file never stalls the other clients
+    def __init__(self, host=HOST, port=PORT, workers=4, cache_tables=CACHE_TABLES):
+        self.host = host
+        self.port = port
+        table_cache.max_tables = max(table_cache.max_tables, cache_tables)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.server = None
+
+    async def client(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, raw = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    url = urlsplit(target)
+                    body = json.loads(raw) if raw else {}
+                    server_stats["requests"] += 1
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, handle, method, url.path, parse_qs(url.query), body)
+                    response = encode_response(200, result, keep_alive)
+                except HttpError as e:
+                    response = encode_response(e.status, {"error": str(e)}, keep_alive)
+                except json.JSONDecodeError as e:
+                    response = encode_response(400, {"error": f"Invalid JSON: {e}"}, keep_alive)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    response = encode_response(500, {"error": str(e)}, False)
+                    keep_alive = False
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def reap_connections(self):
+        while True:
+            await asyncio.sleep(1.0)
+            pool.close_idle()
+
+    async def serve(self, ready=None):
+        self.server = await asyncio.start_server(self.client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        reaper = asyncio.ensure_future(self.reap_connections())
+        if ready:
+            ready(self)
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            reaper.cancel()
+            pool.close_idle(0)
+            self.executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    service = Service(port=port)
+    try:
+        asyncio.run(service.serve(lambda s: print(f"Serving crane and mast data on http://{s.host}:{s.port}/")))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,174 @@
+import csv
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from load_chart import normalize_header
+
+SITE_FIELDS = ["crane_model", "jib_length", "mast_model", "height", "soil_bearing"]
+RESULT_FIELDS = ["site"] + SITE_FIELDS + [
+    "sections", "tower_height",
+    "in_service_moment", "in_service_vertical_force", "in_service_horizontal_force",
+    "out_of_service_moment", "out_of_service_vertical_force", "out_of_service_horizontal_force",
+    "footing_width", "footing_depth", "ballast_blocks", "cost", "status"]
+
+# Statuses a rerun keeps; any other row is calculated again
+FINAL_STATUSES = ("ok", "no passing footing")
+
+# Sites per pool job; small enough that a checkpoint is never far behind
+CHUNK_SIZE = 8
+
+def site_rows(header, rows):
+    # Sites as dicts; a "site" column names them, otherwise the row number does
+    names = [normalize_header(name) for name in header]
+    missing = [field for field in SITE_FIELDS if field not in names]
+    if missing:
+        raise ValueError(f"Site list is missing columns: {', '.join(missing)}")
+    for number, row in enumerate(rows, start=1):
+        if not any(str(value).strip() for value in row if value is not None):
+            continue
+        site = dict(zip(names, row))
+        site["site"] = str(site.get("site") or number).strip()
+        yield site
+
+def read_sites(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            return list(site_rows(header, reader)) if header else []
+    if extension in ('.xlsx', '.xlsm', '.xls'):
+        import pandas as pd
+        frame = pd.read_excel(path, header=0)
+        return list(site_rows(frame.columns, frame.itertuples(index=False, name=None)))
+    raise ValueError(f"Unsupported site list format: {extension or path}")
+
+def calculate_site(site, criteria_options=None):
+    # One output row. Data problems are reported in status, not raised, so one bad
+    # site never stops the batch. Crane and mast data come through the resolver cache.
+    from foundation import FootingCriteria, size_footing
+    from main import cached_mast_data
+    from tower_config import resolve
+    result = {field: site.get(field) for field in ["site"] + SITE_FIELDS}
+    try:
+        jib_length = float(site["jib_length"])
+        height = float(site["height"])
+        soil_bearing = float(site["soil_bearing"])
+        mast = cached_mast_data(str(site["mast_model"]).strip())
+        if mast is None:
+            raise ValueError(f"No data for mast model {site['mast_model']}")
+        # Enough sections to reach the required height
+        sections = max(1, math.ceil(height / mast[2] - 1e-9))
+        config = resolve(str(site["crane_model"]).strip(), jib_length, mast[0], sections)
+    except (TypeError, ValueError, ZeroDivisionError) as e:
+        result["status"] = f"error: {e}"
+        return result
+    result.update(sections=sections, tower_height=config.free_standing_height)
+    for prefix, values in (("in_service", config.in_service), ("out_of_service", config.out_of_service)):
+        for name, value in zip(("moment", "vertical_force", "horizontal_force"), values):
+            result[f"{prefix}_{name}"] = value
+    criteria = FootingCriteria(allowable_bearing=soil_bearing, **(criteria_options or {}))
+    design = size_footing([config.in_service, config.out_of_service], criteria)
+    if design is None:
+        result["status"] = "no passing footing"
+    else:
+        result.update(footing_width=design["width"], footing_depth=design["depth"],
+                      ballast_blocks=design["blocks"], cost=design["cost"], status="ok")
+    return result
+
+def _site_job(job):
+    sites, criteria_options = job
+    return [calculate_site(site, criteria_options) for site in sites]
+
+def completed_sites(out_path):
+    # Sites already in the output file with a final result. Error rows (bad input,
+    # missing data) are dropped from the file so the rerun calculates them again
+    # without duplicating them, as is a line cut short by an interrupted run.
+    if not os.path.exists(out_path):
+        return set()
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    with open(out_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        header = reader.fieldnames
+    kept = [row for row in rows if row.get("status") in FINAL_STATUSES]
+    if len(kept) < len(rows):
+        temporary = f"{out_path}.tmp"
+        with open(temporary, "w", newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(kept)
+        os.replace(temporary, out_path)
+    return {row["site"] for row in kept}
+
+def run_batch(site_path, out_path, workers=None, criteria_options=None, progress=None):
+    # Results are appended to out_path as they complete; rerunning the same command
+    # after an interruption skips the sites already written.
+    # Returns (sites calculated, sites skipped, seconds)
+    start = time.perf_counter()
+    sites = read_sites(site_path)
+    counts = Counter(site["site"] for site in sites)
+    duplicates = sorted(name for name, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate site names: {', '.join(duplicates[:10])}")
+    done = completed_sites(out_path)
+    pending = [site for site in sites if site["site"] not in done]
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+
+    new_file = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+    with open(out_path, "a", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        finished = 0
+
+        def write(results):
+            nonlocal finished
+            writer.writerows(results)
+            # Each completed chunk is on disk before the next one is reported
+            f.flush()
+            os.fsync(f.fileno())
+            finished += len(results)
+            if progress:
+                progress(finished, len(pending))
+
+        if workers == 1 or len(chunks) < 2:
+            for chunk in chunks:
+                write(_site_job((chunk, criteria_options)))
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(_site_job, (chunk, criteria_options)) for chunk in chunks]
+                for future in as_completed(futures):
+                    write(future.result())
+            finally:
+                # On an interrupt, queued chunks are dropped; the next run picks them up
+                pool.shutdown(wait=True, cancel_futures=True)
+    return finished, len(sites) - len(pending), time.perf_counter() - start
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python site_batch.py <site list .csv/.xlsx> <results .csv> [<workers>]")
+        print(f"       site list columns: {', '.join(SITE_FIELDS)} (optional: site)")
+        sys.exit(2)
+
+    def show(done, total):
+        print(f"\r{done}/{total} sites", end="", flush=True)
+    try:
+        count, skipped, seconds = run_batch(sys.argv[1], sys.argv[2],
+                                            int(sys.argv[3]) if len(sys.argv) == 4 else None, progress=show)
+    except (OSError, ValueError) as e:
+        print(f"Batch failed: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume.")
+        sys.exit(130)
+    print(f"\nCalculated {count} sites in {seconds:.3f} s"
+          + (f" ({skipped} already done, resumed)." if skipped else "."))
@@ -0,0 +1,287 @@
+import glob
+import gzip
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from main import CRANE_FIELDS, MAST_FIELDS, CraneDatabase, MastDatabase, table_cache
+
+SITE_FILE = "sync_site.json"
+BUNDLE_SUFFIX = ".bundle"
+
+# table: (key column, every column in order)
+TABLES = {"crane_data": ("jib_length", CRANE_FIELDS), "mast_data": ("mast_model", MAST_FIELDS)}
+
+def site_id(name=None):
+    # Name of this copy of the data; created on first use, or renamed when name is given
+    if name is None and os.path.exists(SITE_FILE):
+        with open(SITE_FILE) as f:
+            return json.load(f)["site"]
+    name = name or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+    with open(SITE_FILE, "w") as f:
+        json.dump({"site": name}, f)
+    return name
+
+def synced_databases():
+    paths = sorted(path.replace(os.sep, "/") for path in glob.glob("CraneData/*_crane.db"))
+    if os.path.exists(MastDatabase.db_name):
+        paths.append(MastDatabase.db_name)
+    return paths
+
+def open_database(path):
+    # CraneDatabase/MastDatabase create the table and changelog triggers if missing.
+    # Only paths of that shape are accepted, so a bundle cannot write anywhere else.
+    if path == MastDatabase.db_name:
+        return MastDatabase(), "mast_data"
+    directory, name = path.split("/", 1) if "/" in path else ("", path)
+    if directory != "CraneData" or "/" in name or not name.endswith("_crane.db"):
+        raise ValueError(f"Not a model database: {path}")
+    return CraneDatabase(name[:-len("_crane.db")]), "crane_data"
+
+def create_sync_tables(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS _sync_peers (
+        peer TEXT PRIMARY KEY,
+        imported_seq INTEGER NOT NULL DEFAULT 0,
+        acked_seq INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS _sync_conflicts (
+        id INTEGER PRIMARY KEY,
+        peer TEXT,
+        row_key,
+        local TEXT,
+        remote TEXT,
+        detected_at REAL
+    )
+    ''')
+
+def database_changes(cursor, table, since):
+    # Current state of every row changed locally after seq since:
+    # [[seq, key, values or None when deleted], ...] plus the newest seq in the log
+    key, fields = TABLES[table]
+    select = f"SELECT {', '.join(fields)} FROM {table} WHERE {key} = ?"
+    latest = cursor.execute(
+        "SELECT row_key, MAX(seq) FROM _changelog WHERE origin IS NULL AND seq > ? GROUP BY row_key",
+        (since,)).fetchall()
+    changes = []
+    for row_key, seq in latest:
+        values = cursor.execute(select, (row_key,)).fetchone()
+        changes.append([seq, row_key, list(values) if values else None])
+    high = cursor.execute("SELECT MAX(seq) FROM _changelog").fetchone()[0] or 0
+    return sorted(changes, key=lambda change: change[0]), high
+
+def export_database(path, site):
+    # Bundle entry with the changes no known peer has acknowledged yet
+    db, table = open_database(path)
+    try:
+        create_sync_tables(db.cursor)
+        peers = db.cursor.execute("SELECT peer, imported_seq, acked_seq FROM _sync_peers").fetchall()
+        since = min((acked for _, _, acked in peers), default=0)
+        changes, high = database_changes(db.cursor, table, since)
+        db.conn.commit()
+    finally:
+        db.close()
+    # Every known peer is acked, 0 included, so a new peer's exporter starts from 0
+    acks = {peer: imported for peer, imported, _ in peers}
+    if not changes and not acks:
+        return None
+    return {"table": table, "since": since, "seq": high, "changes": changes, "acks": acks}
+
+def export_bundle(bundle_path, site=None):
+    # Writes the local changes of every database to bundle_path (gzip JSON).
+    # Returns (changes, errors)
+    site = site or site_id()
+    databases = {}
+    errors = {}
+    for path in synced_databases():
+        try:
+            entry = export_database(path, site)
+        except (sqlite3.Error, ValueError) as e:
+            errors[path] = str(e)
+            continue
+        if entry:
+            databases[path] = entry
+    bundle = {"site": site, "created": time.time(), "databases": databases}
+    # Written to a temporary name first so a peer never reads half a bundle
+    temporary = f"{bundle_path}.tmp"
+    with gzip.open(temporary, "wt", encoding="utf-8") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    os.replace(temporary, bundle_path)
+    return sum(len(entry["changes"]) for entry in databases.values()), errors
+
+def apply_changes(db, table, peer, entry, site):
+    # Applies a peer's changes to one database. A row the peer changed is a conflict
+    # when this site also changed it after the last version the peer had seen; the
+    # local row is kept and the conflict recorded. An entry that starts after what
+    # was imported from the peer so far leaves a gap, so the import position is
+    # only advanced when the entry covers it. Returns (applied, conflicts)
+    key, fields = TABLES[table]
+    cursor = db.cursor
+    create_sync_tables(cursor)
+    cursor.execute("INSERT OR IGNORE INTO _sync_peers (peer) VALUES (?)", (peer,))
+    imported = cursor.execute("SELECT imported_seq FROM _sync_peers WHERE peer = ?", (peer,)).fetchone()[0]
+    peer_ack = entry["acks"].get(site, 0)
+    select = f"SELECT {', '.join(fields)} FROM {table} WHERE {key} = ?"
+    insert = f"INSERT OR REPLACE INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' for _ in fields)})"
+    delete = f"DELETE FROM {table} WHERE {key} = ?"
+    applied = []
+    conflicts = []
+    with db.conn:
+        for seq, row_key, values in entry["changes"]:
+            if seq <= imported:
+                continue
+            local = cursor.execute(select, (row_key,)).fetchone()
+            if (list(local) if local else None) == values:
+                continue
+            local_seq = cursor.execute("SELECT MAX(seq) FROM _changelog WHERE row_key = ? AND origin IS NULL",
+                                       (row_key,)).fetchone()[0]
+            if local_seq and local_seq > peer_ack:
+                cursor.execute("INSERT INTO _sync_conflicts (peer, row_key, local, remote, detected_at) "
+                               "VALUES (?, ?, ?, ?, ?)",
+                               (peer, row_key, json.dumps(list(local) if local else None), json.dumps(values),
+                                time.time()))
+                conflicts.append((row_key, list(local) if local else None, values))
+                continue
+            before = cursor.execute("SELECT MAX(seq) FROM _changelog").fetchone()[0] or 0
+            if values is None:
+                cursor.execute(delete, (row_key,))
+            else:
+                cursor.execute(insert, values)
+            # Logged as the peer's change so it is not sent back
+            cursor.execute("UPDATE _changelog SET origin = ?, origin_seq = ? WHERE seq > ?", (peer, seq, before))
+            applied.append(row_key)
+        covered = entry["seq"] if entry.get("since", 0) <= imported else imported
+        cursor.execute("UPDATE _sync_peers SET imported_seq = MAX(imported_seq, ?), acked_seq = MAX(acked_seq, ?) "
+                       "WHERE peer = ?", (covered, peer_ack, peer))
+    if applied:
+        table_cache.invalidate(db.db_name)
+    return len(applied), conflicts
+
+def import_bundle(bundle_path, site=None):
+    # Returns {"site", "applied", "conflicts": {path: [...]}, "errors": {path: message}}
+    site = site or site_id()
+    with gzip.open(bundle_path, "rt", encoding="utf-8") as f:
+        bundle = json.load(f)
+    peer = bundle["site"]
+    if peer == site:
+        raise ValueError(f"{bundle_path} was written by this site")
+    report = {"site": peer, "applied": 0, "conflicts": {}, "errors": {}}
+    for path, entry in bundle["databases"].items():
+        try:
+            db, table = open_database(path)
+        except (sqlite3.Error, ValueError) as e:
+            report["errors"][path] = str(e)
+            continue
+        try:
+            if table != entry["table"]:
+                raise ValueError(f"table {entry['table']} does not match {table}")
+            applied, conflicts = apply_changes(db, table, peer, entry, site)
+        except (sqlite3.Error, ValueError) as e:
+            report["errors"][path] = str(e)
+            continue
+        finally:
+            db.close()
+        report["applied"] += applied
+        if conflicts:
+            report["conflicts"][path] = conflicts
+    # Databases the peer has not acknowledged yet: everything in them is still news to it
+    for path in synced_databases():
+        if path in bundle["databases"]:
+            continue
+        try:
+            db, _ = open_database(path)
+            try:
+                create_sync_tables(db.cursor)
+                db.cursor.execute("INSERT OR IGNORE INTO _sync_peers (peer) VALUES (?)", (peer,))
+                db.conn.commit()
+            finally:
+                db.close()
+        except (sqlite3.Error, ValueError) as e:
+            report["errors"][path] = str(e)
+    return report
+
+def sync_directory(directory, site=None):
+    # Shared-folder sync: import every other site's bundle, then publish ours.
+    # Returns (reports, exported changes, export errors)
+    site = site or site_id()
+    os.makedirs(directory, exist_ok=True)
+    own = os.path.join(directory, site + BUNDLE_SUFFIX)
+    reports = []
+    for path in sorted(glob.glob(os.path.join(directory, "*" + BUNDLE_SUFFIX))):
+        if os.path.abspath(path) != os.path.abspath(own):
+            reports.append(import_bundle(path, site))
+    exported, errors = export_bundle(own, site)
+    return reports, exported, errors
+
+def list_conflicts():
+    # {path: [(id, peer, key, local values, remote values, detected_at)]}
+    results = {}
+    for path in synced_databases():
+        db, _ = open_database(path)
+        try:
+            create_sync_tables(db.cursor)
+            rows = db.cursor.execute("SELECT id, peer, row_key, local, remote, detected_at "
+                                     "FROM _sync_conflicts ORDER BY id").fetchall()
+            db.conn.commit()
+        finally:
+            db.close()
+        if rows:
+            results[path] = [(i, peer, key, json.loads(local), json.loads(remote), at)
+                             for i, peer, key, local, remote, at in rows]
+    return results
+
+def clear_conflicts():
+    for path in synced_databases():
+        db, _ = open_database(path)
+        try:
+            create_sync_tables(db.cursor)
+            with db.conn:
+                db.cursor.execute("DELETE FROM _sync_conflicts")
+        finally:
+            db.close()
+
+def print_report(report):
+    print(f"{report['site']}: applied {report['applied']} changes")
+    for path, conflicts in report["conflicts"].items():
+        for row_key, local, remote in conflicts:
+            print(f"  CONFLICT {path} [{row_key}]: kept {local}, theirs {remote}")
+    for path, error in report["errors"].items():
+        print(f"  Failed {path}: {error}")
+
+if __name__ == "__main__":
+    commands = ("site", "export", "import", "dir", "conflicts")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands or (sys.argv[1] in commands[1:4] and len(sys.argv) != 3):
+        print("Usage: python sync.py site [<name>]")
+        print("       python sync.py export <bundle file>")
+        print("       python sync.py import <bundle file>")
+        print("       python sync.py dir <shared directory>")
+        print("       python sync.py conflicts [--clear]")
+        sys.exit(2)
+    command = sys.argv[1]
+    if command == "site":
+        print(site_id(sys.argv[2] if len(sys.argv) > 2 else None))
+    elif command == "export":
+        count, errors = export_bundle(sys.argv[2])
+        for path, error in errors.items():
+            print(f"Failed {path}: {error}")
+        print(f"Exported {count} changes to {sys.argv[2]} ({os.path.getsize(sys.argv[2])} bytes).")
+    elif command == "import":
+        print_report(import_bundle(sys.argv[2]))
+    elif command == "dir":
+        reports, count, errors = sync_directory(sys.argv[2])
+        for report in reports:
+            print_report(report)
+        for path, error in errors.items():
+            print(f"Failed {path}: {error}")
+        print(f"Published {count} changes.")
+    elif "--clear" in sys.argv:
+        clear_conflicts()
+    else:
+        for path, rows in list_conflicts().items():
+            for i, peer, row_key, local, remote, _ in rows:
+                print(f"{path} #{i} [{row_key}] from {peer}: kept {local}, theirs {remote}")
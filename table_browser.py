@@ -0,0 +1,295 @@
+from collections import OrderedDict
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTableView, QLabel
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from main import connect, table_cache
+
+class SqlTableModel(QAbstractTableModel):
+    # Pages rows out of one SQLite table on demand. Only the most recently used
+    # pages are kept in memory, so browsing a large table stays flat in memory.
+    # Sorting and filtering are done by SQLite. Pages are found by keyset (the sort
+    # key of the row before each page), so page 500 costs the same as page 1, and
+    # every query runs on the task pool with its own connection.
+    def __init__(self, db_name, table, columns, key_columns, tasks, on_error=None,
+                 page_size=200, max_pages=20, parent=None):
+        super().__init__(parent)
+        self.db_name = db_name
+        self.table = table
+        self.columns = columns
+        self.key_columns = key_columns
+        self.tasks = tasks
+        self.on_error = on_error
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.order_by = list(key_columns)
+        self.descending = False
+        self.filter_text = ""
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        # Results of queries started before a reset are dropped
+        self.beginResetModel()
+        self.generation += 1
+        self.pages = OrderedDict()
+        # page_starts[n] is the sort key of the last row before page n
+        self.page_starts = [None]
+        self.pending = set()
+        self.loaded = 0
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def sort_expressions(self):
+        # NULLs sort first, as in SQLite, but as a value row comparisons can use
+        return [column if column in self.key_columns else f"IFNULL({column}, -1e308)" for column in self.order_by]
+
+    def page_query(self, start):
+        expressions = self.sort_expressions()
+        conditions = []
+        params = []
+        if self.filter_text:
+            conditions.append(f"CAST({self.key_columns[-1]} AS TEXT) LIKE ? ESCAPE '\\'")
+            # The filter is a plain prefix; % and _ typed by the user are not wildcards
+            escaped = self.filter_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(escaped + "%")
+        if start is not None:
+            placeholders = ", ".join("?" for _ in start)
+            conditions.append(f"({', '.join(expressions)}) {'<' if self.descending else '>'} ({placeholders})")
+            params.extend(start)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if self.descending else "ASC"
+        order = ", ".join(f"{expression} {direction}" for expression in expressions)
+        # The sort key is selected after the columns to find the next page's start
+        sql = (f"SELECT {', '.join(self.columns + expressions)} FROM {self.table} {where} "
+               f"ORDER BY {order} LIMIT ?")
+        return sql, params + [self.page_size]
+
+    def request_page(self, page):
+        if page in self.pending or page >= len(self.page_starts):
+            return
+        self.pending.add(page)
+        sql, params = self.page_query(self.page_starts[page])
+        generation = self.generation
+        self.tasks.submit(read_rows, self.db_name, sql, params,
+                          on_result=lambda rows: self.page_loaded(generation, page, rows),
+                          on_error=lambda message: self.page_failed(generation, page, message))
+
+    def page_loaded(self, generation, page, rows):
+        if generation != self.generation:
+            return
+        self.pending.discard(page)
+        width = len(self.columns)
+        self.pages[page] = [row[:width] for row in rows]
+        self.pages.move_to_end(page)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        if page * self.page_size == self.loaded:
+            # The next page beyond what the view has seen
+            if len(rows) < self.page_size:
+                self.exhausted = True
+            else:
+                self.page_starts.append(rows[-1][width:])
+            if rows:
+                self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + len(rows) - 1)
+                self.loaded += len(rows)
+                self.endInsertRows()
+        elif rows:
+            first = page * self.page_size
+            self.dataChanged.emit(self.index(first, 0), self.index(first + len(rows) - 1, len(self.columns) - 1))
+
+    def page_failed(self, generation, page, message):
+        # The page can be asked for again when it is next shown
+        if generation == self.generation:
+            self.pending.discard(page)
+        self.failed(generation, message)
+
+    def failed(self, generation, message):
+        if generation == self.generation and self.on_error:
+            self.on_error(message)
+
+    def row_values(self, row):
+        # None while the row's page is being (re)loaded
+        page = self.pages.get(row // self.page_size)
+        if page is None:
+            self.request_page(row // self.page_size)
+            return None
+        self.pages.move_to_end(row // self.page_size)
+        offset = row % self.page_size
+        return page[offset] if offset < len(page) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted and self.loaded // self.page_size not in self.pending
+
+    def fetchMore(self, parent):
+        if self.canFetchMore(parent):
+            self.request_page(self.loaded // self.page_size)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return QVariant()
+        values = self.row_values(index.row())
+        if values is None:
+            return QVariant()
+        return values[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self.columns[section].replace("_", " ").title()
+        return section + 1
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.columns[index.column()] not in self.key_columns:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def key_of(self, row):
+        values = self.row_values(row)
+        if values is None:
+            return None
+        return [values[self.columns.index(column)] for column in self.key_columns]
+
+    def key_condition(self):
+        return " AND ".join(f"{column} = ?" for column in self.key_columns)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return False
+        key = self.key_of(index.row())
+        if key is None:
+            return False
+        column = self.columns[index.column()]
+        page = index.row() // self.page_size
+        generation = self.generation
+
+        def written(_):
+            if generation != self.generation:
+                return
+            if column in self.order_by:
+                # The row may now sort elsewhere
+                self.reset()
+            else:
+                self.pages.pop(page, None)
+                self.request_page(page)
+        self.tasks.submit(write_rows, self.db_name,
+                          f"UPDATE {self.table} SET {column} = ? WHERE {self.key_condition()}",
+                          [[number] + key], on_result=written,
+                          on_error=lambda message: self.failed(generation, message))
+        return True
+
+    def delete_rows(self, rows, on_deleted=None):
+        keys = [key for key in (self.key_of(row) for row in rows) if key is not None]
+        generation = self.generation
+
+        def deleted(count):
+            self.reset()
+            if on_deleted:
+                on_deleted(count)
+        self.tasks.submit(write_rows, self.db_name, f"DELETE FROM {self.table} WHERE {self.key_condition()}",
+                          keys, on_result=deleted, on_error=lambda message: self.failed(generation, message))
+        return len(keys)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        name = self.columns[column]
+        self.order_by = [name] + [key for key in self.key_columns if key != name]
+        self.descending = order == Qt.DescendingOrder
+        self.reset()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.reset()
+
+    def close(self):
+        # Queries still running finish on their own connection and are ignored
+        self.generation += 1
+
+def read_rows(db_name, sql, params):
+    conn = connect(db_name, read_only=True)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def write_rows(db_name, sql, rows):
+    conn = connect(db_name)
+    try:
+        with conn:
+            conn.executemany(sql, rows)
+    finally:
+        conn.close()
+    table_cache.invalidate(db_name)
+    return len(rows)
+
+class TableBrowser(QWidget):
+    def __init__(self, parent):
+        super().__init__()
+        self.parent = parent
+        self.model = None
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.title = QLabel()
+        layout.addWidget(self.title)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter")
+        self.filter_input.returnPressed.connect(self.apply_filter)
+        layout.addWidget(self.filter_input)
+
+        self.view = QTableView()
+        self.view.setSortingEnabled(True)
+        self.view.setSelectionBehavior(QTableView.SelectRows)
+        layout.addWidget(self.view)
+
+        buttons = QHBoxLayout()
+        self.delete_btn = QPushButton("Delete Selected")
+        self.back_btn = QPushButton("Back")
+        buttons.addWidget(self.delete_btn)
+        buttons.addWidget(self.back_btn)
+        layout.addLayout(buttons)
+
+        self.delete_btn.clicked.connect(self.delete_selected)
+        self.back_btn.clicked.connect(self.go_back)
+
+    def open_table(self, title, db_name, table, columns, key_columns):
+        self.close_model()
+        self.title.setText(title)
+        self.filter_input.clear()
+        self.filter_input.setPlaceholderText(f"Filter by {key_columns[-1].replace('_', ' ')}")
+        self.model = SqlTableModel(db_name, table, columns, key_columns, self.parent.main_window.tasks,
+                                   on_error=self.parent.show_error, parent=self)
+        self.view.setModel(self.model)
+        self.view.sortByColumn(0, Qt.AscendingOrder)
+
+    def apply_filter(self):
+        if self.model:
+            self.model.set_filter(self.filter_input.text())
+
+    def delete_selected(self):
+        if not self.model:
+            return
+        rows = sorted({index.row() for index in self.view.selectionModel().selectedRows()})
+        if rows:
+            self.model.delete_rows(rows, lambda count: self.parent.result_text.setText(f"Deleted {count} rows."))
+
+    def close_model(self):
+        if self.model:
+            self.view.setModel(None)
+            self.model.close()
+            self.model = None
+
+    def go_back(self):
+        self.close_model()
+        self.parent.show_main_buttons()
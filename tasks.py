@@ -0,0 +1,85 @@
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class TaskCancelled(Exception):
+    pass
+
+class TaskSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+class Task(QRunnable):
+    # Runs fn(*args, **kwargs) on a pool thread. Database objects must be created
+    # inside fn so every worker thread uses its own SQLite connection.
+    def __init__(self, fn, args, kwargs, with_task=False):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.with_task = with_task
+        self.signals = TaskSignals()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report_progress(self, done, total):
+        # Long jobs call this between steps; it doubles as the cancellation point
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            if self.cancel_event.is_set():
+                return
+            kwargs = dict(self.kwargs)
+            if self.with_task:
+                kwargs["task"] = self
+            result = self.fn(*self.args, **kwargs)
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e) or type(e).__name__)
+        else:
+            if not self.cancel_event.is_set():
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+class TaskRunner:
+    def __init__(self, max_threads=None):
+        self.pool = QThreadPool()
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.tasks = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None, with_task=False, **kwargs):
+        # Callbacks run on the GUI thread. Pass with_task=True to have fn receive the
+        # Task as task= for report_progress() and is_cancelled().
+        task = Task(fn, args, kwargs, with_task)
+        if on_result:
+            task.signals.result.connect(on_result)
+        if on_error:
+            task.signals.error.connect(on_error)
+        if on_progress:
+            task.signals.progress.connect(on_progress)
+        # Keep the Python side alive until Qt is done with it
+        self.tasks.add(task)
+        task.signals.finished.connect(lambda: self.tasks.discard(task))
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
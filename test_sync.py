@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from main import CraneDatabase
+from sync import sync_directory
+
+def crane_row(jib_length):
+    return [jib_length] + [float(i) for i in range(1, 12)]
+
+class ThreeSiteSyncTest(unittest.TestCase):
+    # Each site is its own working directory; bundles meet in a shared one
+    def setUp(self):
+        self.previous = os.getcwd()
+        self.temporary = tempfile.TemporaryDirectory()
+        self.shared = os.path.join(self.temporary.name, "shared")
+        self.sites = {}
+        for name in ("A", "B", "C"):
+            self.sites[name] = os.path.join(self.temporary.name, name)
+            os.makedirs(self.sites[name])
+
+    def tearDown(self):
+        os.chdir(self.previous)
+        self.temporary.cleanup()
+
+    def add(self, site, jib_length):
+        os.chdir(self.sites[site])
+        db = CraneDatabase("tc1")
+        try:
+            db.add_many([crane_row(jib_length)])
+        finally:
+            db.close()
+
+    def sync(self, *sites):
+        for site in sites:
+            os.chdir(self.sites[site])
+            reports, _, errors = sync_directory(self.shared, site)
+            self.assertEqual(errors, {})
+            for report in reports:
+                self.assertEqual(report["errors"], {})
+                self.assertEqual(report["conflicts"], {})
+
+    def jib_lengths(self, site):
+        path = os.path.join(self.sites[site], "CraneData", "tc1_crane.db")
+        if not os.path.exists(path):
+            return []
+        conn = sqlite3.connect(path)
+        try:
+            return [row[0] for row in conn.execute("SELECT jib_length FROM crane_data ORDER BY jib_length")]
+        finally:
+            conn.close()
+
+    def test_late_site_receives_older_rows(self):
+        self.add("A", 50.0)
+        self.add("A", 55.0)
+        for _ in range(2):
+            self.sync("A", "B")
+        self.assertEqual(self.jib_lengths("B"), [50.0, 55.0])
+        self.add("A", 60.0)
+        for _ in range(3):
+            self.sync("A", "B", "C")
+        for site in ("A", "B", "C"):
+            self.assertEqual(self.jib_lengths(site), [50.0, 55.0, 60.0], site)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from cache import file_signature
+from main import MastDatabase, cached_mast_data, crane_db_path, normalize_model_name
+
+class TowerConfig:
+    # Derived quantities of one crane + jib length + mast + section count.
+    # Reactions are (moment, vertical force, horizontal force) at the foundation.
+    __slots__ = ("crane_model", "jib_length", "mast_model", "sections", "interpolated",
+                 "total_self_weight", "total_wind_area", "free_standing_height",
+                 "in_service", "out_of_service")
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TowerConfig is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("TowerConfig is immutable")
+
+    def __repr__(self):
+        return (f"TowerConfig({self.crane_model} @ {self.jib_length} m, {self.mast_model} x {self.sections}, "
+                f"height {self.free_standing_height} m)")
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+def build_config(crane_model, jib_length, mast_model, sections):
+    from envelope import compute_reactions
+    from jib_index import crane_jib_index
+    index = crane_jib_index(crane_model)
+    row = index.get(jib_length)
+    interpolated = row is None
+    if interpolated:
+        row = index.interpolate(jib_length)
+    if row is None:
+        raise ValueError(f"No data for {crane_model} at jib length {jib_length}")
+    mast = cached_mast_data(mast_model)
+    if mast is None:
+        raise ValueError(f"No data for mast model {mast_model}")
+    self_weight, mast_height, mast_wind_area = mast[1:4]
+    in_service, out_of_service = compute_reactions([row], [[self_weight, mast_height, mast_wind_area]], [sections])
+    return TowerConfig(
+        crane_model=crane_model, jib_length=jib_length, mast_model=mast_model, sections=sections,
+        interpolated=interpolated,
+        total_self_weight=self_weight * sections,
+        total_wind_area=mast_wind_area * sections,
+        free_standing_height=mast_height * sections,
+        in_service=tuple(float(values[0, 0, 0]) for values in in_service),
+        out_of_service=tuple(float(values[0, 0, 0]) for values in out_of_service),
+    )
+
+class ConfigCache:
+    # Bounded LRU of resolved configurations. Each entry remembers the state of the
+    # crane and mast files it was built from and is rebuilt once either changes.
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def resolve(self, crane_model, jib_length, mast_model, sections):
+        key = (normalize_model_name(crane_model), float(jib_length), mast_model, int(sections))
+        signature = (file_signature(crane_db_path(crane_model)), file_signature(MastDatabase.db_name))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.entries.move_to_end(key)
+                return entry[1]
+        config = build_config(*key)
+        with self.lock:
+            self.entries[key] = (signature, config)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return config
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+config_cache = ConfigCache()
+
+def resolve(crane_model, jib_length, mast_model, sections):
+    # Memoized TowerConfig; raises ValueError when the crane or mast data is missing
+    return config_cache.resolve(crane_model, jib_length, mast_model, sections)
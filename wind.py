@@ -0,0 +1,74 @@
+import numpy as np
+from main import cached_mast_table
+
+class Eurocode:
+    # EN 1991-1-4 peak velocity pressure on flat terrain (c0 = 1, kI = 1)
+    TERRAIN = {"0": (0.003, 1.0), "I": (0.01, 1.0), "II": (0.05, 2.0), "III": (0.3, 5.0), "IV": (1.0, 10.0)}
+
+    def __init__(self, terrain="II"):
+        if terrain not in self.TERRAIN:
+            raise ValueError(f"Unknown terrain category: {terrain}")
+        self.z0, self.z_min = self.TERRAIN[terrain]
+        self.kr = 0.19 * (self.z0 / 0.05) ** 0.07
+
+    def exposure(self, z):
+        log = np.log(np.maximum(z, self.z_min) / self.z0)
+        return self.kr ** 2 * log * (log + 7.0)
+
+class PowerLaw:
+    # Pressure grows with (z / z_ref) ** (2 * alpha) above z_min
+    def __init__(self, alpha=0.16, z_ref=10.0, z_min=5.0):
+        self.alpha = alpha
+        self.z_ref = z_ref
+        self.z_min = z_min
+
+    def exposure(self, z):
+        return (np.maximum(z, self.z_min) / self.z_ref) ** (2 * self.alpha)
+
+class Uniform:
+    # Same pressure at every height, as in the envelope engine
+    def exposure(self, z):
+        return np.ones_like(np.asarray(z, dtype=float))
+
+CODES = {"eurocode": Eurocode, "power": PowerLaw, "uniform": Uniform}
+
+def mast_wind_profile(section_heights, section_areas, max_sections, basic_pressure, code=None,
+                      force_coefficient=1.0):
+    # Base shear and base moment for towers of 1..max_sections sections of every mast
+    # in one array pass. section_heights/section_areas: (K,) per-section height and
+    # wind area. Returns (shear, moment), each (K, max_sections); column n - 1 is a
+    # tower of n sections.
+    code = code or Eurocode()
+    heights = np.asarray(section_heights, dtype=float)[:, None]
+    areas = np.asarray(section_areas, dtype=float)[:, None]
+    centres = (np.arange(max_sections)[None, :] + 0.5) * heights
+    forces = basic_pressure * code.exposure(centres) * force_coefficient * areas
+    return np.cumsum(forces, axis=1), np.cumsum(forces * centres, axis=1)
+
+def crane_wind(tower_heights, wind_area, delta_h, basic_pressure, code=None, force_coefficient=1.0):
+    # Force and base moment of wind on the crane itself, acting delta_h above the mast top
+    code = code or Eurocode()
+    z = np.asarray(tower_heights, dtype=float) + delta_h
+    force = basic_pressure * code.exposure(z) * force_coefficient * wind_area
+    return force, force * z
+
+def catalog_wind_sweep(max_sections=40, basic_pressure=0.5, code=None, force_coefficient=1.0,
+                       mast_models=None, crane_row=None):
+    # Height sweep for every stored mast (or mast_models). With a crane_data row the
+    # crane's wind_area/delta_h is added at the top of each tower.
+    masts = cached_mast_table()
+    mast_models = sorted(masts) if mast_models is None else list(mast_models)
+    missing = [name for name in mast_models if name not in masts]
+    if missing:
+        raise ValueError(f"Unknown mast models: {', '.join(missing)}")
+    rows = np.array([masts[name][1:4] for name in mast_models], dtype=float).reshape(len(mast_models), 3)
+    shear, moment = mast_wind_profile(rows[:, 1], rows[:, 2], max_sections, basic_pressure, code, force_coefficient)
+    heights = rows[:, 1:2] * np.arange(1, max_sections + 1)[None, :]
+    if crane_row is not None:
+        from main import CRANE_FIELDS
+        wind_area = crane_row[CRANE_FIELDS.index("wind_area")]
+        delta_h = crane_row[CRANE_FIELDS.index("delta_h")]
+        force, crane_moment = crane_wind(heights, wind_area, delta_h, basic_pressure, code, force_coefficient)
+        shear = shear + force
+        moment = moment + crane_moment
+    return {"mast_models": mast_models, "tower_heights": heights, "shear": shear, "moment": moment}